@@ -7,7 +7,49 @@
 
 """Class for Audit Action registered via entrypoints."""
 
-from dataclasses import dataclass
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from string import Formatter
+from threading import Lock
+from types import MappingProxyType
+
+from importlib_metadata import entry_points
+
+
+def _template_fields(template):
+    """Names of the top-level fields of a message template."""
+    names = set()
+    for _, field_name, _, _ in Formatter().parse(template):
+        if field_name:
+            names.add(re.split(r"[.\[]", field_name, maxsplit=1)[0])
+    return frozenset(names)
+
+
+def _user(log):
+    """User of an audit log."""
+    return log.get("user") or {}
+
+
+def _resource(log):
+    """Resource of an audit log."""
+    return log.get("resource") or {}
+
+
+_message_context = {
+    "id": lambda log: log.get("id"),
+    "created": lambda log: log.get("created", log.get("@timestamp")),
+    "action": lambda log: log.get("action"),
+    "user": _user,
+    "user_id": lambda log: _user(log).get("id"),
+    "user_name": lambda log: _user(log).get("name"),
+    "user_email": lambda log: _user(log).get("email"),
+    "resource": _resource,
+    "resource_id": lambda log: _resource(log).get("id"),
+    "resource_type": lambda log: _resource(log).get("type"),
+    "metadata": lambda log: log.get("metadata") or {},
+}
+"""Fields of the message templates, computed from a dumped audit log."""
 
 
 @dataclass(frozen=True)
@@ -41,10 +83,42 @@ class AuditAction:
 
     name: str
     message_template: str
+    message_fields: frozenset = field(init=False, repr=False, compare=False)
+    _format: object = field(init=False, repr=False, compare=False)
+    _context: tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Parse the message template once."""
+        message_fields = _template_fields(self.message_template)
+        object.__setattr__(self, "message_fields", message_fields)
+        object.__setattr__(self, "_format", self.message_template.format_map)
+        object.__setattr__(
+            self,
+            "_context",
+            tuple(
+                (name, _message_context[name])
+                for name in message_fields
+                if name in _message_context
+            ),
+        )
 
     def render_message(self, data):
         """Render the message using the provided data."""
-        return self.message_template.format(**data)
+        return self._format(data)
+
+    def render_log_message(self, log):
+        """Render the message of a dumped audit log.
+
+        Only the fields used by the template are computed from the log.
+
+        :param log: Audit log as dumped by the schema or the search dumper.
+        :returns: The message, or ``None`` if the log misses some of its
+            fields or has values the template cannot format.
+        """
+        try:
+            return self._format({name: get(log) for name, get in self._context})
+        except (KeyError, IndexError, AttributeError, ValueError, TypeError):
+            return None
 
     def __str__(self):
         """Return str(self)."""
@@ -54,3 +128,99 @@ class AuditAction:
     def __repr__(self):
         """Return repr(self)."""
         return f"<AuditAction '{self.name}'>"
+
+
+class AuditActionRegistry(Mapping):
+    """Registry of the audit actions registered via entrypoints.
+
+    The entrypoints are only loaded on the first lookup, after which the
+    registry is frozen.
+    """
+
+    def __init__(self, group):
+        """Constructor.
+
+        :param group: Entrypoint group of the functions returning the actions.
+        """
+        self.group = group
+        self._actions = None
+        self._lock = Lock()
+
+    def load(self):
+        """Load the actions of the entrypoints, if not loaded yet."""
+        if self._actions is None:
+            with self._lock:
+                if self._actions is None:
+                    actions = {}
+                    for ep in entry_points(group=self.group):
+                        resource_actions = ep.load()
+                        actions.update(resource_actions())
+                    self._actions = MappingProxyType(actions)
+        return self._actions
+
+    def reset(self):
+        """Forget the loaded actions, to load them again on the next lookup.
+
+        Only meant for the tests, which change the entrypoints between
+        applications.
+        """
+        with self._lock:
+            self._actions = None
+
+    def labels(self, names):
+        """Labels of actions, e.g. for the values of a facet."""
+        actions = self._actions if self._actions is not None else self.load()
+        return {k: actions[k].name if k in actions else k for k in names}
+
+    def __getitem__(self, name):
+        """Get an action by name."""
+        actions = self._actions if self._actions is not None else self.load()
+        return actions[name]
+
+    def __iter__(self):
+        """Iterate over the names of the actions."""
+        return iter(self.load())
+
+    def __len__(self):
+        """Number of actions."""
+        return len(self.load())
+
+
+actions_registry = AuditActionRegistry("invenio_audit_logs.actions")
+"""Registry of the actions, shared by the applications as the entrypoints."""
+
+
+class MessageRenderer:
+    """Render the messages of a page of audit logs.
+
+    The action of each log is looked up once per renderer, instead of once
+    per log.
+    """
+
+    def __init__(self, registry=None):
+        """Constructor.
+
+        :param registry: Registry of the actions, by default the one of the
+            entrypoints.
+        """
+        self._registry = actions_registry if registry is None else registry
+        self._actions = {}
+
+    def render(self, log):
+        """Add its message to a dumped audit log, unless it already has one.
+
+        :returns: The audit log.
+        """
+        if "message" in log:
+            return log
+
+        name = log.get("action")
+        try:
+            action = self._actions[name]
+        except KeyError:
+            action = self._actions[name] = self._registry.get(name)
+        if action is not None:
+            message = action.render_log_message(log)
+            if message is not None:
+                log["message"] = message
+        return log
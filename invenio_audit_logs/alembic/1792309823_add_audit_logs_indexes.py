@@ -0,0 +1,56 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Add indexes to the Audit Logs table."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1792309823"
+down_revision = "1743073720"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_index(
+        "ix_audit_logs_metadata_created",
+        "audit_logs_metadata",
+        ["created"],
+        postgresql_using="brin",
+    )
+    op.create_index(
+        "ix_audit_logs_metadata_user_id_created",
+        "audit_logs_metadata",
+        ["user_id", "created"],
+    )
+    op.create_index(
+        "ix_audit_logs_metadata_resource_type_created",
+        "audit_logs_metadata",
+        ["resource_type", "created"],
+    )
+    op.create_index(
+        "ix_audit_logs_metadata_action_created",
+        "audit_logs_metadata",
+        ["action", "created"],
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index(
+        "ix_audit_logs_metadata_action_created", table_name="audit_logs_metadata"
+    )
+    op.drop_index(
+        "ix_audit_logs_metadata_resource_type_created",
+        table_name="audit_logs_metadata",
+    )
+    op.drop_index(
+        "ix_audit_logs_metadata_user_id_created", table_name="audit_logs_metadata"
+    )
+    op.drop_index("ix_audit_logs_metadata_created", table_name="audit_logs_metadata")
@@ -0,0 +1,77 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Add resource id to the Audit Logs table."""
+
+import json
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1792309891"
+down_revision = "1792309823"
+branch_labels = ()
+depends_on = None
+
+
+def backfill_resource_id(batch_size=10000):
+    """Copy the resource id of the JSON data to the new column."""
+    conn = op.get_bind()
+    if conn.dialect.name == "postgresql":
+        op.execute(
+            "UPDATE audit_logs_metadata "
+            "SET resource_id = COALESCE(json->'resource'->>'id', '')"
+        )
+        return
+
+    table = sa.table(
+        "audit_logs_metadata",
+        sa.column("id"),
+        sa.column("json"),
+        sa.column("resource_id", sa.String()),
+    )
+    while True:
+        rows = conn.execute(
+            sa.select(table.c.id, table.c.json)
+            .where(table.c.resource_id.is_(None))
+            .limit(batch_size)
+        ).fetchall()
+        if not rows:
+            break
+        for id_, data in rows:
+            if isinstance(data, str):
+                data = json.loads(data)
+            resource = (data or {}).get("resource") or {}
+            conn.execute(
+                table.update()
+                .where(table.c.id == id_)
+                .values(resource_id=str(resource.get("id") or ""))
+            )
+
+
+def upgrade():
+    """Upgrade database."""
+    op.add_column(
+        "audit_logs_metadata",
+        sa.Column("resource_id", sa.String(length=255), nullable=True),
+    )
+    backfill_resource_id()
+    op.alter_column("audit_logs_metadata", "resource_id", nullable=False)
+    op.create_index(
+        "ix_audit_logs_metadata_resource_created",
+        "audit_logs_metadata",
+        ["resource_type", "resource_id", "created"],
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index(
+        "ix_audit_logs_metadata_resource_created", table_name="audit_logs_metadata"
+    )
+    op.drop_column("audit_logs_metadata", "resource_id")
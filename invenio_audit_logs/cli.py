@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Command-line tools for audit logs."""
+
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from invenio_access.permissions import system_identity
+from invenio_db import db
+
+from .proxies import current_audit_logs_service
+from .records.datastream import AuditLogDataStream
+from .records.partitions import AuditLogPartitionManager
+from .services.reindex import AuditLogReindex
+
+
+@click.group("audit-logs")
+def audit_logs():
+    """Audit logs commands."""
+
+
+@audit_logs.command("export")
+@click.argument("output_dir", type=click.Path(file_okay=False))
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["ndjson", "csv"]),
+    default="ndjson",
+    show_default=True,
+)
+@click.option(
+    "--compression",
+    type=click.Choice(["gzip", "zstd"]),
+    default="gzip",
+    show_default=True,
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=100000,
+    show_default=True,
+    help="Number of logs per file.",
+)
+@click.option("--from", "created_from", type=click.DateTime(), help="Start date.")
+@click.option("--to", "created_to", type=click.DateTime(), help="End date (excluded).")
+@click.option("--user-id", help="Only export the logs of this user.")
+@click.option("--resource-type", help="Only export the logs of this resource type.")
+@click.option("--resource-id", help="Only export the logs of this resource.")
+@click.option("--action", help="Only export the logs of this action.")
+@click.option(
+    "--resume/--no-resume",
+    default=True,
+    show_default=True,
+    help="Resume an interrupted export from its checkpoint.",
+)
+@with_appcontext
+def export(output_dir, fmt, compression, chunk_size, resume, **filters):
+    """Export audit logs to compressed files in OUTPUT_DIR."""
+    try:
+        checkpoint = current_audit_logs_service.export(
+            system_identity,
+            output_dir,
+            fmt=fmt,
+            compression=compression,
+            chunk_size=chunk_size,
+            resume=resume,
+            **filters,
+        )
+    except (RuntimeError, ValueError) as e:
+        raise click.ClickException(str(e))
+
+    click.secho(
+        f"Exported {checkpoint['exported']} audit logs "
+        f"in {len(checkpoint['chunks'])} file(s).",
+        fg="green",
+    )
+
+
+@audit_logs.command("reindex")
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Number of worker processes (defaults to the number of CPUs).",
+)
+@click.option(
+    "--days",
+    type=click.IntRange(min=1),
+    default=7,
+    show_default=True,
+    help="Number of days of logs per partition.",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="Number of logs per bulk request.",
+)
+@click.option("--from", "created_from", type=click.DateTime(), help="Start date.")
+@click.option("--to", "created_to", type=click.DateTime(), help="End date (excluded).")
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False),
+    help="File recording the completed partitions, to resume the reindex.",
+)
+@with_appcontext
+def reindex(workers, days, batch_size, created_from, created_to, checkpoint):
+    """Index the audit logs of the database, in parallel.
+
+    The logs are created in the index, so the index should be empty or the
+    already indexed logs are reported as failed.
+    """
+    reindexer = AuditLogReindex(
+        current_app._get_current_object(),
+        current_audit_logs_service,
+        workers=workers,
+        interval=timedelta(days=days),
+        batch_size=batch_size,
+        checkpoint_path=checkpoint,
+    )
+    try:
+        partitions = reindexer.partitions(created_from, created_to)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.secho(f"Reindexing {len(partitions)} partition(s)...", fg="green")
+
+    total_indexed = total_failed = 0
+    for start, end, indexed, failed in reindexer.run(partitions):
+        total_indexed += indexed
+        total_failed += failed
+        click.echo(
+            f"{start.isoformat()} - {end.isoformat()}: "
+            f"{indexed} indexed, {failed} failed"
+        )
+
+    click.secho(
+        f"Indexed {total_indexed} audit logs ({total_failed} failed).",
+        fg="red" if total_failed else "green",
+    )
+
+
+@audit_logs.command("purge")
+@with_appcontext
+def purge():
+    """Purge the audit logs expired according to the retention rules."""
+    report = current_audit_logs_service.purge(system_identity)
+    for rule in report["rules"]:
+        filters = ", ".join(
+            f"{key}={rule[key]}" for key in ("action", "resource_type") if key in rule
+        )
+        click.echo(
+            f"[{filters or 'all'}] before {rule['cutoff']}: "
+            f"{rule['deleted']} logs, {rule['deleted_documents']} documents "
+            f"({rule['duration']:.1f}s)"
+        )
+    click.secho(
+        f"Purged {report['deleted']} audit logs in {report['duration']:.1f}s.",
+        fg="green",
+    )
+
+
+@audit_logs.command("archive")
+@click.option(
+    "--older-than",
+    type=click.IntRange(min=1),
+    required=True,
+    help="Archive the logs older than this number of days.",
+)
+@with_appcontext
+def archive(older_than):
+    """Move the old audit logs to the archive, in AUDIT_LOGS_ARCHIVE_PATH."""
+    before = datetime.utcnow() - timedelta(days=older_than)
+    try:
+        segments, archived = current_audit_logs_service.archive_logs(
+            system_identity, before
+        )
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.secho(
+        f"Archived {archived} audit logs in {len(segments)} segment(s).", fg="green"
+    )
+
+
+@audit_logs.group()
+def partitions():
+    """Manage the monthly partitions of the audit logs table (PostgreSQL)."""
+
+
+def _months_ahead_option(f):
+    """Option for the number of months of partitions to create."""
+    return click.option(
+        "--months-ahead",
+        type=click.IntRange(min=0),
+        help="Number of months to create partitions for.",
+    )(f)
+
+
+@partitions.command("convert")
+@_months_ahead_option
+@with_appcontext
+def convert_partitions(months_ahead):
+    """Convert the audit logs table to a partitioned table.
+
+    The existing logs are kept in a single partition, without being copied.
+    Their bound is validated first, which reads the table without blocking
+    the writes.
+    """
+    if months_ahead is None:
+        months_ahead = current_app.config["AUDIT_LOGS_PARTITIONS_MONTHS_AHEAD"]
+    try:
+        created = AuditLogPartitionManager().convert(months_ahead=months_ahead)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    db.session.commit()
+    click.secho(f"Partitioned table, created {len(created)} partition(s).", fg="green")
+
+
+@partitions.command("create")
+@_months_ahead_option
+@with_appcontext
+def create_partitions(months_ahead):
+    """Create the missing partitions up to some months ahead."""
+    manager = AuditLogPartitionManager()
+    if not manager.is_partitioned():
+        raise click.ClickException("The audit logs table is not partitioned.")
+    if months_ahead is None:
+        months_ahead = current_app.config["AUDIT_LOGS_PARTITIONS_MONTHS_AHEAD"]
+    created = manager.create_partitions(months_ahead=months_ahead)
+    db.session.commit()
+    for name in created:
+        click.echo(f"Created {name}")
+
+
+@partitions.command("detach")
+@click.option(
+    "--before",
+    type=click.DateTime(),
+    required=True,
+    help="Detach the partitions of the logs created before this date.",
+)
+@click.option("--drop", is_flag=True, help="Drop the detached partitions.")
+@with_appcontext
+def detach_partitions(before, drop):
+    """Detach (and drop) the partitions of old audit logs."""
+    manager = AuditLogPartitionManager()
+    if not manager.is_partitioned():
+        raise click.ClickException("The audit logs table is not partitioned.")
+    detached = manager.detach_partitions(before, drop=drop)
+    db.session.commit()
+    for name in detached:
+        click.echo(f"{'Dropped' if drop else 'Detached'} {name}")
+
+
+@partitions.command("list")
+@with_appcontext
+def list_partitions():
+    """List the partitions of the audit logs table."""
+    manager = AuditLogPartitionManager()
+    if not manager.is_partitioned():
+        raise click.ClickException("The audit logs table is not partitioned.")
+    for name, end in manager.list_partitions():
+        click.echo(f"{name}: logs created before {end.isoformat()}")
+
+
+@audit_logs.group()
+def datastream():
+    """Manage the backing indices of the audit logs data stream on OpenSearch."""
+
+
+@datastream.command("install-policy")
+@with_appcontext
+def install_policy():
+    """Install the rollover policy of the backing indices."""
+    data_stream = AuditLogDataStream()
+    added = data_stream.install_policy(
+        current_app.config["AUDIT_LOGS_ROLLOVER_CONDITIONS"]
+    )
+    click.secho(
+        f"Installed policy {data_stream.policy_id} "
+        f"on {len(added)} backing index(es).",
+        fg="green",
+    )
+
+
+@datastream.command("rollover")
+@with_appcontext
+def rollover():
+    """Roll the data stream over to a new write index."""
+    click.secho(f"Rolled over to {AuditLogDataStream().rollover()}", fg="green")
+
+
+@datastream.command("list")
+@with_appcontext
+def list_backing_indices():
+    """List the backing indices with the time range of their logs."""
+    for index, first, last, count in AuditLogDataStream().time_ranges():
+        if first is None:
+            click.echo(f"{index}: empty")
+        else:
+            click.echo(
+                f"{index}: {count} logs from {first.isoformat()} "
+                f"to {last.isoformat()}"
+            )
+
+
+@datastream.command("migrate")
+@click.option(
+    "--source",
+    default="auditlog-audit-log-v1.0.0",
+    show_default=True,
+    help="Previous version of the data stream.",
+)
+@click.option(
+    "--wait/--no-wait",
+    default=True,
+    show_default=True,
+    help="Wait for the copy to complete, or run it as a search engine task.",
+)
+@click.option(
+    "--delete-source",
+    is_flag=True,
+    help="Delete the previous data stream once all its logs are copied.",
+)
+@with_appcontext
+def migrate(source, wait, delete_source):
+    """Copy the logs of a previous version of the data stream.
+
+    Searches return the logs of both data streams until the previous one is
+    deleted.
+    """
+    data_stream = AuditLogDataStream()
+    response = data_stream.migrate(source, wait=wait)
+    if not wait:
+        click.secho(f"Started the copy as task {response}.", fg="green")
+        return
+
+    failures = response.get("failures", [])
+    click.secho(
+        f"Copied {response['created']} audit logs from {source} "
+        f"to {data_stream.name} ({len(failures)} failed).",
+        fg="red" if failures else "green",
+    )
+    if delete_source and not failures:
+        data_stream.delete_data_stream(source)
+        click.secho(f"Deleted {source}.", fg="green")
@@ -9,7 +9,7 @@
 
 from invenio_records_resources.services.records.facets import TermsFacet
 
-from .proxies import current_audit_logs_actions_registry
+from .actions import actions_registry
 
 AUDIT_LOGS_SEARCH = {
     "facets": ["resource", "user", "action_name"],
@@ -37,9 +37,7 @@ AUDIT_LOGS_FACETS = {
         facet=TermsFacet(
             field="action",
             label="Action",
-            value_labels=lambda keys: {
-                k: current_audit_logs_actions_registry[k].name for k in keys
-            },
+            value_labels=actions_registry.labels,
         ),
         ui=dict(field="action"),
     ),
@@ -62,3 +60,184 @@ AUDIT_LOGS_SORT_OPTIONS = {
 
 AUDIT_LOGS_ENABLED = False
 """Feature flag. Disabled by default due to experimental nature of the APIs. Feature is not fully stable."""
+
+AUDIT_LOGS_INDEX_ASYNC = False
+"""Index audit logs asynchronously.
+
+When enabled, creating an audit log only writes the database row and publishes
+its id to the ``audit-logs`` message queue. The queue is drained in bulk by the
+``invenio_audit_logs.tasks.process_audit_logs_queue`` Celery task, which should
+be scheduled via ``CELERY_BEAT_SCHEDULE``.
+"""
+
+AUDIT_LOGS_BUFFER_EVENTS = False
+"""Buffer the audit logs created within the same unit of work.
+
+When enabled, all the logs of a unit of work are inserted with a single flush
+once it commits, and are indexed with a single bulk request afterwards.
+"""
+
+AUDIT_LOGS_WRITE_BEHIND = False
+"""Persist the audit logs in the background.
+
+When enabled, created audit logs are put in a bounded in-memory buffer, which
+a background thread inserts and indexes in batches. The logs are then not part
+of the unit of work that created them.
+"""
+
+AUDIT_LOGS_WRITE_BEHIND_MAX_SIZE = 10000
+"""Maximum number of audit logs waiting in the write-behind buffer."""
+
+AUDIT_LOGS_WRITE_BEHIND_BATCH_SIZE = 500
+"""Number of audit logs that triggers a flush of the write-behind buffer."""
+
+AUDIT_LOGS_WRITE_BEHIND_FLUSH_INTERVAL = 1.0
+"""Maximum number of seconds between two flushes of the write-behind buffer."""
+
+AUDIT_LOGS_WRITE_BEHIND_OVERFLOW_POLICY = "block"
+"""Policy applied when the write-behind buffer is full.
+
+One of ``block``, ``drop_oldest`` or ``spill``.
+"""
+
+AUDIT_LOGS_WRITE_BEHIND_SPILL_PATH = None
+"""File used to spill audit logs when the write-behind buffer is full."""
+
+AUDIT_LOGS_USER_CACHE_SIZE = 4096
+"""Maximum number of users cached when resolving the user of an audit log."""
+
+AUDIT_LOGS_USER_CACHE_TTL = 300
+"""Number of seconds a resolved user is cached.
+
+Cached users are invalidated when they are updated in the same process, the
+TTL bounds how long other processes may serve outdated user information.
+"""
+
+AUDIT_LOGS_READ_CACHE_SIZE = 0
+"""Maximum number of audit logs kept in memory for reads by id (0 disables it).
+
+Audit logs are never updated, so the cached logs only become stale once
+purged. A purge clears the cache of its own process only.
+"""
+
+AUDIT_LOGS_READ_CACHE_TTL = 300
+"""Number of seconds an audit log is cached for reads by id.
+
+The TTL bounds how long other processes may serve purged logs.
+"""
+
+AUDIT_LOGS_COMPILED_VALIDATION = False
+"""Validate audit log events with a schema compiled once at startup.
+
+Valid events skip most of the marshmallow machinery, invalid events are still
+validated by marshmallow so that the reported errors do not change.
+"""
+
+AUDIT_LOGS_PARTITIONS_MONTHS_AHEAD = 3
+"""Number of months for which partitions are created ahead of time.
+
+Only used when the audit logs table is partitioned (PostgreSQL only), see the
+``invenio audit-logs partitions`` commands. Logs created after the last
+partition are kept in a default partition until their partition is created, so
+the partitions should be created regularly, e.g. with:
+
+.. code-block:: python
+
+    CELERY_BEAT_SCHEDULE = {
+        "audit-logs-partitions": {
+            "task": "invenio_audit_logs.tasks.create_audit_logs_partitions",
+            "schedule": timedelta(days=1),
+        },
+    }
+"""
+
+AUDIT_LOGS_RETENTION_RULES = []
+"""Retention rules of the audit logs, enforced by the ``purge_audit_logs`` task.
+
+Each rule is a dictionary with the maximum age (``timedelta``) of the logs,
+optionally restricted to an ``action`` and/or a ``resource_type``. A log is
+purged once it is older than the maximum age of any rule it matches, e.g.:
+
+.. code-block:: python
+
+    AUDIT_LOGS_RETENTION_RULES = [
+        {"action": "draft.create", "max_age": timedelta(days=90)},
+        {"resource_type": "user", "max_age": timedelta(days=365)},
+        {"max_age": timedelta(days=5 * 365)},
+    ]
+
+The task is not scheduled by this module. Schedule it in the instance, e.g.:
+
+.. code-block:: python
+
+    CELERY_BEAT_SCHEDULE = {
+        "audit-logs-purge": {
+            "task": "invenio_audit_logs.tasks.purge_audit_logs",
+            "schedule": crontab(minute=0, hour=3),
+        },
+    }
+"""
+
+AUDIT_LOGS_RETENTION_BATCH_SIZE = 10000
+"""Number of audit logs deleted from the database per transaction.
+
+Used when purging the expired logs and when moving logs to the archive.
+"""
+
+AUDIT_LOGS_SEARCH_CACHE_ENABLED = False
+"""Cache the search results of audit logs in the Invenio cache."""
+
+AUDIT_LOGS_SEARCH_CACHE_WINDOW = 3600
+"""Duration in seconds of the time windows invalidated by late writes."""
+
+AUDIT_LOGS_SEARCH_CACHE_RECENT_TTL = 30
+"""Time to live in seconds of the results of searches reaching recent logs."""
+
+AUDIT_LOGS_SEARCH_CACHE_PAST_TTL = 0
+"""Time to live in seconds of the results of searches of past time windows.
+
+Such results only change when logs are written late in their time range, which
+invalidates them, so they are kept until evicted by default (``0``).
+"""
+
+AUDIT_LOGS_SEARCH_CACHE_GRACE = 60
+"""Delay in seconds after its end before a time window is considered closed.
+
+Logs created at the end of a window may only become searchable once indexed
+and refreshed, so the searches of the window are cached as recent ones until
+then. It should exceed the indexing delay and the refresh interval.
+"""
+
+AUDIT_LOGS_ROLLOVER_CONDITIONS = {"min_size": "30gb", "min_index_age": "30d"}
+"""Conditions of the rollover of the backing indices of the data stream.
+
+The conditions are used by the Index State Management policy installed with
+``invenio audit-logs datastream install-policy``: the write index is rolled
+over as soon as any of them is met.
+"""
+
+AUDIT_LOGS_ARCHIVE_PATH = None
+"""Directory of the archive of old audit logs, on local or mounted storage.
+
+When set, logs can be moved to the archive with ``invenio audit-logs archive``
+and archived logs are still returned when read by id.
+"""
+
+AUDIT_LOGS_ARCHIVE_SEGMENT_SIZE = 100000
+"""Number of audit logs per segment file of the archive."""
+
+AUDIT_LOGS_HTTP_CACHE_CONTROL = "private, max-age=31536000, immutable"
+"""Cache-Control header of the responses of a single audit log.
+
+Audit logs are never updated, so they can be cached for a long time. They are
+only readable by administrators, so they are not stored by shared caches by
+default: use ``public`` only behind a reverse proxy that caches per user.
+"""
+
+AUDIT_LOGS_INDEX_MESSAGE = False
+"""Render the message of the action when indexing a log, and store it.
+
+Searches then return the stored message instead of rendering it on every read.
+The stored messages are not updated when the message templates change, until
+the logs are reindexed.
+"""
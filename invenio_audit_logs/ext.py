@@ -7,11 +7,14 @@
 
 """Module providing audit logging features for Invenio.."""
 
-from importlib_metadata import entry_points
+from invenio_accounts.signals import datastore_post_commit
 
 from . import config
+from .actions import actions_registry
+from .receivers import invalidate_user_cache
 from .resources import AuditLogResource, AuditLogResourceConfig
 from .services import AuditLogService, AuditLogServiceConfig, DisabledAuditLogService
+from .services.writebehind import AuditLogWriteBehind
 
 
 class InvenioAuditLogs(object):
@@ -27,7 +30,8 @@ class InvenioAuditLogs(object):
         self.init_config(app)
         self.init_services(app)
         self.init_resources(app)
-        self.load_actions_registry()
+        self.init_signals()
+        self.actions_registry = actions_registry
         app.extensions["invenio-audit-logs"] = self
 
     def init_config(self, app):
@@ -41,6 +45,10 @@ class InvenioAuditLogs(object):
         self.audit_log_service = AuditLogService(
             config=AuditLogServiceConfig.build(app),
         )
+        if app.config["AUDIT_LOGS_WRITE_BEHIND"]:
+            self.audit_log_service.write_behind = AuditLogWriteBehind.from_config(
+                app, self.audit_log_service
+            )
 
     def init_resources(self, app):
         """Init resources."""
@@ -49,10 +57,10 @@ class InvenioAuditLogs(object):
             config=AuditLogResourceConfig.build(app),
         )
 
+    def init_signals(self):
+        """Connect the signal receivers."""
+        datastore_post_commit.connect(invalidate_user_cache)
+
     def load_actions_registry(self):
-        """Action loading registry."""
-        self.actions_registry = {}
-        for ep in entry_points(group="invenio_audit_logs.actions"):
-            resource_actions = ep.load()
-            for action_name, action_factory in resource_actions().items():
-                self.actions_registry[action_name] = action_factory
+        """Load the actions registry, instead of on the first lookup."""
+        return self.actions_registry.load()
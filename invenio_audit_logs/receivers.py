@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Signal receivers for audit logs."""
+
+from flask import current_app
+from invenio_accounts.proxies import current_db_change_history
+
+
+def invalidate_user_cache(sender, session=None, **kwargs):
+    """Invalidate the cached users changed in the committed session."""
+    ext = current_app.extensions.get("invenio-audit-logs")
+    changes = current_db_change_history.sessions.get(id(session))
+    if ext is None or changes is None:
+        return
+
+    for user_id in changes.updated_users | changes.deleted_users:
+        ext.audit_log_service.user_cache.delete(str(user_id))
@@ -8,15 +8,20 @@
 
 """API classes for audit log event."""
 
-from datetime import datetime
-from uuid import UUID
+from copy import deepcopy
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
 
+from flask import current_app
+from invenio_db import db
 from invenio_records.dumpers import SearchDumper
+from invenio_records.signals import after_record_insert, before_record_insert
 from invenio_records.systemfields import DictField, ModelField
 from invenio_records_resources.records.api import Record
 from invenio_records_resources.records.systemfields import IndexField
 
 from . import models, systemfields
+from .dumpers import EmailDomainDumperExt, MessageDumperExt
 
 
 class AuditLog(Record):
@@ -25,15 +30,19 @@ class AuditLog(Record):
     model_cls = models.AuditLog
     """The model class for the log."""
 
+    dumper_extensions = (EmailDomainDumperExt(), MessageDumperExt())
+    """Extensions of the search dumper, also used to load the dumps."""
+
     dumper = SearchDumper(
         model_fields={
             "id": ("id", UUID),
             "created": ("@timestamp", datetime),
         },
+        extensions=list(dumper_extensions),
     )
     """Search dumper with configured dump keys."""
 
-    index = IndexField("auditlog-audit-log-v1.0.0", search_alias="auditlog")
+    index = IndexField("auditlog-audit-log-v2.0.0", search_alias="auditlog")
     """The search engine index to use."""
 
     id = ModelField("id", dump_type=UUID)
@@ -48,4 +57,79 @@ class AuditLog(Record):
 
     resource_type = ModelField("resource_type", dump=False, dump_type=str)
 
+    resource_id = ModelField("resource_id", dump=False, dump_type=str)
+
     resource = DictField("resource")
+
+    @classmethod
+    def build(cls, data, id_=None, **kwargs):
+        """Build a new audit log without adding it to the database session.
+
+        Runs the same extensions as ``create`` and encodes the record data on
+        the model, so that the log can later be persisted with ``insert_many``.
+        """
+        # The id is assigned upfront, as the log is not flushed right away
+        id_ = id_ or uuid4()
+        record = cls(data, model=cls.model_cls(id=id_, data=data), **kwargs)
+
+        if cls.send_signals:
+            before_record_insert.send(current_app._get_current_object(), record=record)
+
+        for e in cls._extensions:
+            e.pre_create(record)
+        for e in cls._extensions:
+            e.pre_commit(record)
+
+        record.model.json = record._validate()
+        return record
+
+    @classmethod
+    def from_dump(cls, dump):
+        """Build an audit log from its search dump, e.g. archived or cached.
+
+        Unlike ``loads``, the model fields are restored from the keys of the
+        dump. The model is not added to the database session.
+        """
+        data = {
+            k: deepcopy(v) for k, v in dump.items() if k not in ("id", "@timestamp")
+        }
+        for extension in cls.dumper_extensions:
+            extension.load(data, cls)
+
+        created = datetime.fromisoformat(dump["@timestamp"])
+        if created.tzinfo is not None:
+            created = created.astimezone(timezone.utc).replace(tzinfo=None)
+        # Like the schema, the lifted up fields are empty if missing
+        resource = dump.get("resource") or {}
+        user = dump.get("user") or {}
+        model = cls.model_cls(
+            id=UUID(dump["id"]),
+            created=created,
+            action=dump.get("action"),
+            resource_type=resource.get("type"),
+            resource_id=resource.get("id"),
+            user_id=user.get("id"),
+            data=data,
+            # Audit logs are never updated, so they keep their first version
+            version_id=1,
+        )
+        return cls(data, model=model)
+
+    @classmethod
+    def insert_many(cls, records, session=None):
+        """Insert built audit logs with a single flush.
+
+        :param records: List of audit logs created with ``build``.
+        :param session: Database session, by default the one of ``db``.
+        """
+        session = session or db.session
+        with session.begin_nested():
+            session.add_all([record.model for record in records])
+
+        for record in records:
+            if cls.send_signals:
+                after_record_insert.send(
+                    current_app._get_current_object(), record=record
+                )
+            for e in cls._extensions:
+                e.post_create(record)
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Backing indices of the audit logs data stream on OpenSearch."""
+
+from datetime import datetime, timezone
+
+from invenio_search import current_search_client
+from invenio_search.engine import search
+from invenio_search.utils import prefix_index
+
+from .api import AuditLog
+
+
+def _from_millis(value):
+    """Naive UTC date of a timestamp in milliseconds."""
+    return datetime.fromtimestamp(value / 1000, tz=timezone.utc).replace(tzinfo=None)
+
+
+class AuditLogDataStream:
+    """Manage the backing indices of the audit logs data stream.
+
+    The logs are written to a data stream, whose write index is rolled over
+    to a new backing index by an Index State Management (ISM) policy once it
+    reaches a maximum size or age. Backing indices other than the write index
+    no longer receive logs, so they can be skipped by searches outside of their
+    time range and dropped as a whole by the retention.
+    """
+
+    policy_name = "auditlog-rollover"
+
+    # Adds the email domain to the logs copied from a previous version, as
+    # the EmailDomainDumperExt does when indexing them
+    _migrate_script = (
+        "def user = ctx._source.user;"
+        "if (user != null && user.email != null && user.email.contains('@')) {"
+        "  user.email_domain = user.email.substring("
+        "    user.email.lastIndexOf('@') + 1).toLowerCase();"
+        "}"
+    )
+
+    def __init__(self, client=None):
+        """Constructor."""
+        self._client = client or current_search_client
+        # Time ranges of the backing indices other than the write index
+        self._time_ranges = {}
+
+    @property
+    def name(self):
+        """Name of the data stream."""
+        return prefix_index(AuditLog.index._name)
+
+    @property
+    def policy_id(self):
+        """Id of the rollover policy."""
+        return prefix_index(self.policy_name)
+
+    def policy(self, conditions):
+        """Rollover policy applied to the new backing indices.
+
+        :param conditions: Rollover conditions, e.g. ``min_size`` and
+            ``min_index_age``.
+        """
+        return {
+            "policy": {
+                "description": "Rollover of the audit logs backing indices.",
+                "default_state": "hot",
+                "states": [
+                    {
+                        "name": "hot",
+                        "actions": [{"rollover": dict(conditions)}],
+                        "transitions": [],
+                    }
+                ],
+                "ism_template": [
+                    {"index_patterns": [f".ds-{self.name}-*"], "priority": 100}
+                ],
+            }
+        }
+
+    def install_policy(self, conditions):
+        """Create or update the rollover policy.
+
+        The policy is also applied to the existing backing indices without
+        one, as ISM templates only apply to newly created indices.
+
+        :returns: Names of the backing indices the policy was added to.
+        """
+        ism = self._client.plugins.index_management
+        params = {}
+        try:
+            current = ism.get_policy(self.policy_id)
+            params = {
+                "if_seq_no": current["_seq_no"],
+                "if_primary_term": current["_primary_term"],
+            }
+        except search.NotFoundError:
+            pass
+        ism.put_policy(self.policy_id, body=self.policy(conditions), params=params)
+
+        indices = self.backing_indices()
+        if not indices:
+            return []
+        response = ism.add_policy(",".join(indices), body={"policy_id": self.policy_id})
+        added = set(indices)
+        for failed in response.get("failed_indices", []):
+            added.discard(failed["index_name"])
+        return [index for index in indices if index in added]
+
+    def rollover(self):
+        """Roll the data stream over to a new write index.
+
+        :returns: Name of the new write index.
+        """
+        return self._client.indices.rollover(alias=self.name)["new_index"]
+
+    def backing_indices(self):
+        """Names of the backing indices, the last one being the write index."""
+        try:
+            response = self._client.indices.get_data_stream(name=self.name)
+        except search.NotFoundError:
+            return []
+        return [
+            backing_index["index_name"]
+            for data_stream in response["data_streams"]
+            for backing_index in data_stream["indices"]
+        ]
+
+    def time_ranges(self):
+        """Time ranges of the logs of the backing indices.
+
+        :returns: List of ``(name, first, last, count)`` tuples, where
+            ``first`` and ``last`` are the creation dates of the oldest and
+            newest logs of the index, or ``None`` if it is empty. The write
+            index is last.
+        """
+        indices = self.backing_indices()
+        ranges = []
+        for position, index in enumerate(indices):
+            is_write_index = position == len(indices) - 1
+            time_range = self._time_ranges.get(index)
+            if time_range is None:
+                time_range = self._time_range(index)
+                if not is_write_index:
+                    self._time_ranges[index] = time_range
+            ranges.append((index, *time_range))
+        return ranges
+
+    def _time_range(self, index):
+        """Time range and number of the logs of a backing index."""
+        response = self._client.search(
+            index=index,
+            body={
+                "size": 0,
+                "track_total_hits": True,
+                "aggs": {
+                    "first": {"min": {"field": "@timestamp"}},
+                    "last": {"max": {"field": "@timestamp"}},
+                },
+            },
+        )
+        aggregations = response["aggregations"]
+        if aggregations["first"]["value"] is None:
+            return None, None, 0
+        return (
+            _from_millis(aggregations["first"]["value"]),
+            _from_millis(aggregations["last"]["value"]),
+            response["hits"]["total"]["value"],
+        )
+
+    def indices_for_range(self, start=None, end=None):
+        """Names of the backing indices holding logs created in a time range.
+
+        The write index is always included, as it receives new logs.
+
+        :param datetime start: Logs created on or after this date.
+        :param datetime end: Logs created before this date.
+        """
+        ranges = self.time_ranges()
+        indices = []
+        for position, (index, first, last, _) in enumerate(ranges):
+            if position < len(ranges) - 1:
+                if first is None:
+                    continue
+                if (start and last < start) or (end and first >= end):
+                    continue
+            indices.append(index)
+        return indices
+
+    def migrate(self, source, wait=True):
+        """Copy the logs of a previous version of the data stream.
+
+        The logs are copied by the search engine, adding the fields of the
+        current mapping that are computed by the dumper.
+
+        :param source: Name of the previous data stream, e.g.
+            ``auditlog-audit-log-v1.0.0``.
+        :param wait: Wait for the copy to complete. Otherwise, it runs as a
+            task of the search engine.
+        :returns: The reindex response, or the id of the task.
+        """
+        response = self._client.reindex(
+            body={
+                "source": {"index": prefix_index(source)},
+                "dest": {"index": self.name, "op_type": "create"},
+                "conflicts": "proceed",
+                "script": {"lang": "painless", "source": self._migrate_script},
+            },
+            wait_for_completion=wait,
+        )
+        return response if wait else response["task"]
+
+    def delete_data_stream(self, name):
+        """Delete a previous version of the data stream."""
+        self._client.indices.delete_data_stream(name=prefix_index(name))
+
+    def delete_index(self, index):
+        """Delete a backing index other than the write index."""
+        self._client.indices.delete(index=index)
+        self._time_ranges.pop(index, None)
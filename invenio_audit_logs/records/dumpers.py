@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Search dumper extensions for audit logs."""
+
+from flask import current_app
+from invenio_records.dumpers import SearchDumperExt
+
+
+class EmailDomainDumperExt(SearchDumperExt):
+    """Index the domain of the user email as a keyword.
+
+    The domain is aggregated from doc values, instead of being extracted at
+    query time from the email with an analyzer and fielddata.
+    """
+
+    def dump(self, record, data):
+        """Add the email domain to the user."""
+        email = (data.get("user") or {}).get("email")
+        if email and "@" in email:
+            data["user"]["email_domain"] = email.rsplit("@", 1)[1].lower()
+
+    def load(self, data, record_cls):
+        """Remove the email domain from the user."""
+        (data.get("user") or {}).pop("email_domain", None)
+
+
+class MessageDumperExt(SearchDumperExt):
+    """Index the message of the action, rendered when the log is dumped.
+
+    Enabled with ``AUDIT_LOGS_INDEX_MESSAGE``, so that searches return the
+    stored message instead of rendering it.
+    """
+
+    def dump(self, record, data):
+        """Add the rendered message."""
+        if not current_app.config.get("AUDIT_LOGS_INDEX_MESSAGE"):
+            return
+        message = record.action.render_log_message(data)
+        if message is not None:
+            data["message"] = message
+
+    def load(self, data, record_cls):
+        """Remove the rendered message."""
+        data.pop("message", None)
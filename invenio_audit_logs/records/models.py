@@ -17,6 +17,25 @@ class AuditLog(db.Model, RecordMetadataBase):
     """Model class for Audit Log."""
 
     __tablename__ = "audit_logs_metadata"
+    __table_args__ = (
+        # BRIN index, as the logs are inserted in creation order
+        db.Index(
+            "ix_audit_logs_metadata_created",
+            "created",
+            postgresql_using="brin",
+        ),
+        db.Index("ix_audit_logs_metadata_user_id_created", "user_id", "created"),
+        db.Index(
+            "ix_audit_logs_metadata_resource_type_created", "resource_type", "created"
+        ),
+        db.Index("ix_audit_logs_metadata_action_created", "action", "created"),
+        db.Index(
+            "ix_audit_logs_metadata_resource_created",
+            "resource_type",
+            "resource_id",
+            "created",
+        ),
+    )
 
     encoder = None
 
@@ -24,4 +43,6 @@ class AuditLog(db.Model, RecordMetadataBase):
 
     resource_type = db.Column(String(255), nullable=False)
 
+    resource_id = db.Column(String(255), nullable=False)
+
     user_id = db.Column(String(255), nullable=False)
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Monthly partitioning of the audit logs table on PostgreSQL."""
+
+import re
+from datetime import datetime, timedelta
+
+from invenio_db import db
+from sqlalchemy import text
+
+from .models import AuditLog
+
+
+def month_start(date):
+    """First day of the month of a date."""
+    return datetime(date.year, date.month, 1)
+
+
+def next_month(date):
+    """First day of the month after a date."""
+    if date.month == 12:
+        return datetime(date.year + 1, 1, 1)
+    return datetime(date.year, date.month + 1, 1)
+
+
+class AuditLogPartitionManager:
+    """Manage the monthly partitions of the audit logs table.
+
+    Partitioning is optional and only supported on PostgreSQL. Once the table
+    is converted to a table partitioned by range of ``created``, partitions
+    of one month must be created ahead of time, and old partitions can be
+    detached or dropped as a whole instead of deleting their logs.
+
+    Logs created after the last monthly partition are written to a default
+    partition, so that creating logs never fails. They are moved to their
+    monthly partition when it is created.
+
+    The primary key of the partitioned table is ``(id, created)``, as it must
+    include the partition key. The model keeps identifying the logs by their
+    id, which is a random UUID and therefore still unique.
+    """
+
+    table = AuditLog.__tablename__
+    legacy_table = f"{AuditLog.__tablename__}_legacy"
+    default_table = f"{AuditLog.__tablename__}_default"
+
+    _bound_re = re.compile(r"TO \('([^']+)'\)")
+
+    def __init__(self, session=None):
+        """Constructor."""
+        self._session = session or db.session
+
+    def _execute(self, sql, **params):
+        """Execute a SQL statement."""
+        return self._session.execute(text(sql), params)
+
+    def _commit(self):
+        """Commit the current transaction, releasing its locks."""
+        self._session.commit()
+
+    def partition_name(self, start):
+        """Name of the partition of a month."""
+        return f"{self.table}_p{start:%Y_%m}"
+
+    def is_supported(self):
+        """Check if the database supports partitioning."""
+        return self._session.get_bind().dialect.name == "postgresql"
+
+    def is_partitioned(self):
+        """Check if the audit logs table is partitioned."""
+        if not self.is_supported():
+            return False
+        return bool(
+            self._execute(
+                "SELECT 1 FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid "
+                "WHERE c.relname = :table",
+                table=self.table,
+            ).scalar()
+        )
+
+    def list_partitions(self):
+        """List the partitions, ordered by date, except the default one.
+
+        :returns: List of ``(name, end)`` tuples, where ``end`` is the
+            (excluded) upper bound of the creation dates of the partition.
+        """
+        rows = self._execute(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)",
+            table=self.table,
+        )
+        partitions = []
+        for name, bound in rows:
+            if name == self.default_table:
+                continue
+            end = datetime.fromisoformat(self._bound_re.search(bound).group(1))
+            partitions.append((name, end))
+        return sorted(partitions, key=lambda p: p[1])
+
+    def has_default_partition(self):
+        """Check if the audit logs table has a default partition."""
+        return bool(
+            self._execute(
+                "SELECT 1 FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:table AS regclass) AND c.relname = :name",
+                table=self.table,
+                name=self.default_table,
+            ).scalar()
+        )
+
+    def estimate_count(self, name):
+        """Estimated number of logs of a partition, from the table statistics."""
+        count = self._execute(
+            "SELECT reltuples FROM pg_class WHERE relname = :name", name=name
+        ).scalar()
+        return max(int(count or 0), 0)
+
+    def convert(self, months_ahead=3, now=None):
+        """Convert the audit logs table to a partitioned table.
+
+        The existing table is attached as a single partition holding all the
+        existing logs, so no data is copied, and monthly partitions are
+        created from the following month on, as well as the default partition.
+
+        The bound of the existing logs is first checked by a ``CHECK``
+        constraint, added and validated in their own transactions without
+        blocking the writes, so that attaching the table does not scan it
+        while it is locked. The constraint is dropped once attached.
+        """
+        if not self.is_supported():
+            raise RuntimeError("Partitioning is only supported on PostgreSQL.")
+        if self.is_partitioned():
+            raise RuntimeError("The audit logs table is already partitioned.")
+
+        now = now or datetime.utcnow()
+        last = self._execute(f"SELECT max(created) FROM {self.table}").scalar()
+        # Leave a day for the logs created until the table is locked
+        bound = next_month(max(last or now, now + timedelta(days=1)))
+
+        constraint = f"{self.table}_partition_bound"
+        self._execute(
+            f"ALTER TABLE {self.table} DROP CONSTRAINT IF EXISTS {constraint}"
+        )
+        self._execute(
+            f"ALTER TABLE {self.table} ADD CONSTRAINT {constraint} "
+            f"CHECK (created IS NOT NULL AND created < '{bound.isoformat()}') "
+            f"NOT VALID"
+        )
+        self._commit()
+        self._execute(f"ALTER TABLE {self.table} VALIDATE CONSTRAINT {constraint}")
+        self._commit()
+
+        self._execute(f"LOCK TABLE {self.table} IN ACCESS EXCLUSIVE MODE")
+
+        # Rename the table, its primary key and indexes to reuse their names
+        self._execute(f"ALTER TABLE {self.table} RENAME TO {self.legacy_table}")
+        self._execute(
+            f"ALTER TABLE {self.legacy_table} RENAME CONSTRAINT "
+            f"pk_{self.table} TO pk_{self.legacy_table}"
+        )
+        for index in AuditLog.__table__.indexes:
+            self._execute(f"ALTER INDEX {index.name} RENAME TO {index.name}_legacy")
+
+        # The primary key of a partitioned table must include the partition key
+        self._execute(
+            f"CREATE TABLE {self.table} "
+            f"(LIKE {self.legacy_table} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE (created)"
+        )
+        self._execute(
+            f"ALTER TABLE {self.table} "
+            f"ADD CONSTRAINT pk_{self.table} PRIMARY KEY (id, created)"
+        )
+        for index in AuditLog.__table__.indexes:
+            using = index.dialect_options["postgresql"]["using"] or "btree"
+            columns = ", ".join(column.name for column in index.columns)
+            self._execute(
+                f"CREATE INDEX {index.name} ON {self.table} USING {using} ({columns})"
+            )
+
+        self._execute(
+            f"ALTER TABLE {self.table} ATTACH PARTITION {self.legacy_table} "
+            f"FOR VALUES FROM (MINVALUE) TO ('{bound.isoformat()}')"
+        )
+        self._execute(f"ALTER TABLE {self.legacy_table} DROP CONSTRAINT {constraint}")
+        created = self.create_partitions(months_ahead=months_ahead, now=now)
+        self._execute(
+            f"CREATE TABLE {self.default_table} PARTITION OF {self.table} DEFAULT"
+        )
+        return created + [self.default_table]
+
+    def create_partitions(self, months_ahead=3, now=None):
+        """Create the missing partitions up to some months ahead.
+
+        The logs of the default partition created in the month of a new
+        partition are moved to it.
+
+        :returns: Names of the created partitions.
+        """
+        now = now or datetime.utcnow()
+        partitions = self.list_partitions()
+        start = month_start(now)
+        if partitions:
+            start = max(start, partitions[-1][1])
+
+        end = month_start(now)
+        for _ in range(months_ahead + 1):
+            end = next_month(end)
+
+        has_default = start < end and self.has_default_partition()
+        created = []
+        while start < end:
+            name = self.partition_name(start)
+            bounds = (
+                f"FOR VALUES FROM ('{start.isoformat()}') "
+                f"TO ('{next_month(start).isoformat()}')"
+            )
+            if has_default:
+                self._move_default_logs(name, start, next_month(start), bounds)
+            else:
+                self._execute(f"CREATE TABLE {name} PARTITION OF {self.table} {bounds}")
+            created.append(name)
+            start = next_month(start)
+        return created
+
+    def _move_default_logs(self, name, start, end, bounds):
+        """Create a partition with the logs of its month of the default one."""
+        self._execute(f"CREATE TABLE {name} (LIKE {self.table} INCLUDING DEFAULTS)")
+        condition = "created >= :start AND created < :end"
+        self._execute(
+            f"INSERT INTO {name} SELECT * FROM {self.default_table} WHERE {condition}",
+            start=start,
+            end=end,
+        )
+        self._execute(
+            f"DELETE FROM {self.default_table} WHERE {condition}", start=start, end=end
+        )
+        self._execute(f"ALTER TABLE {self.table} ATTACH PARTITION {name} {bounds}")
+
+    def detach_partitions(self, before, drop=False):
+        """Detach the partitions only holding logs created before a date.
+
+        :param before: Date before which logs can be removed.
+        :param drop: Drop the detached partitions.
+        :returns: Names of the detached partitions.
+        """
+        detached = []
+        for name, end in self.list_partitions():
+            if end > before:
+                break
+            self._execute(f"ALTER TABLE {self.table} DETACH PARTITION {name}")
+            if drop:
+                self._execute(f"DROP TABLE {name}")
+            detached.append(name)
+        return detached
@@ -9,8 +9,7 @@
 
 from invenio_records.systemfields import ModelField
 
-from ...actions import AuditAction
-from ...proxies import current_audit_logs_actions_registry
+from ...actions import AuditAction, actions_registry
 
 
 class ActionField(ModelField):
@@ -20,7 +19,7 @@ class ActionField(ModelField):
     def get_instance(action):
         """Ensure that always an instance of AuditAction is returned."""
         if isinstance(action, str):
-            action = current_audit_logs_actions_registry[action]
+            action = actions_registry[action]
 
         if not isinstance(action, AuditAction):
             raise TypeError(f"Expected 'AuditAction' but got: '{type(action)}'")
@@ -75,6 +74,6 @@ class ActionField(ModelField):
 
         action_obj = self.get_instance(_action)
         try:
-            current_audit_logs_actions_registry[action_obj.name]
+            actions_registry[action_obj.name]
         except KeyError:
             raise TypeError(f"Audit action '{action_obj.name}' is not registered.")
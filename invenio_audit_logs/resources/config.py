@@ -8,12 +8,13 @@
 
 """Audit logs resource config."""
 
+from flask_resources import JSONSerializer, MultiDictSchema, ResponseHandler
 from invenio_records_resources.resources import (
     RecordResourceConfig,
     SearchRequestArgsSchema,
 )
 from invenio_records_resources.services.base.config import ConfiguratorMixin
-from marshmallow import fields
+from marshmallow import fields, validate
 
 
 #
@@ -27,6 +28,17 @@ class AuditLogSearchRequestArgsSchema(SearchRequestArgsSchema):
     resource_type = fields.String()
     user_id = fields.String()
     action = fields.String()
+    created_from = fields.DateTime()
+    created_to = fields.DateTime()
+    stream = fields.Boolean()
+    after = fields.String()
+
+
+class AuditLogTimelineRequestArgsSchema(MultiDictSchema):
+    """Pagination parameters for the audit logs of a resource."""
+
+    size = fields.Integer(validate=validate.Range(min=1, max=1000))
+    after = fields.String()
 
 
 #
@@ -41,17 +53,19 @@ class AuditLogResourceConfig(RecordResourceConfig, ConfiguratorMixin):
     routes = {
         "list": "/",
         "item": "/<id>",
+        "timeline": "/resources/<resource_type>/<resource_id>",
     }
 
     request_view_args = {
         "id": fields.UUID(),
+        "resource_type": fields.String(),
+        "resource_id": fields.String(),
     }
 
     request_search_args = AuditLogSearchRequestArgsSchema
+    request_timeline_args = AuditLogTimelineRequestArgsSchema
 
     response_handlers = {
-        "application/vnd.inveniordm.v1+json": RecordResourceConfig.response_handlers[
-            "application/json"
-        ],
-        **RecordResourceConfig.response_handlers,
+        "application/vnd.inveniordm.v1+json": ResponseHandler(JSONSerializer()),
+        "application/json": ResponseHandler(JSONSerializer()),
     }
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Response headers of the audit logs resource."""
+
+from flask import current_app
+from werkzeug.http import quote_etag
+
+
+def audit_log_etag(id_, revision_id):
+    """Strong entity tag of a revision of an audit log, unquoted."""
+    return f"{id_}.{revision_id}"
+
+
+def cache_headers(id_, revision_id):
+    """Validator and caching headers of a revision of an audit log."""
+    return {
+        "ETag": quote_etag(audit_log_etag(id_, revision_id)),
+        "Cache-Control": current_app.config["AUDIT_LOGS_HTTP_CACHE_CONTROL"],
+    }
@@ -8,8 +8,14 @@
 
 """Logs resource."""
 
-from flask import g
-from flask_resources import resource_requestctx, response_handler, route
+from flask import Response, g, request, stream_with_context
+from flask_resources import (
+    from_conf,
+    request_parser,
+    resource_requestctx,
+    response_handler,
+    route,
+)
 from invenio_records_resources.resources.records.resource import (
     RecordResource,
     request_extra_args,
@@ -18,6 +24,12 @@ from invenio_records_resources.resources.records.resource import (
 )
 from invenio_records_resources.resources.records.utils import search_preference
 
+from .headers import audit_log_etag, cache_headers
+
+request_timeline_args = request_parser(
+    from_conf("request_timeline_args"), location="args"
+)
+
 
 #
 # Resource
@@ -41,6 +53,7 @@ class AuditLogResource(RecordResource):
         return [
             route("GET", p(routes["list"]), self.search),
             route("GET", p(routes["item"]), self.read),
+            route("GET", p(routes["timeline"]), self.read_timeline),
         ]
 
     @request_extra_args
@@ -48,21 +61,60 @@ class AuditLogResource(RecordResource):
     @request_view_args
     @response_handler(many=True)
     def search(self):
-        """Perform a search over the logs."""
+        """Perform a search over the logs.
+
+        With the ``stream`` argument, the hits are encoded and sent one at a
+        time instead of serializing the whole page at once. Only plain JSON
+        responses are streamed, other formats are serialized as usual.
+        """
+        stream = resource_requestctx.args.pop("stream", False)
         hits = self.service.search(
             identity=g.identity,
             params=resource_requestctx.args,
             search_preference=search_preference(),
         )
+        if stream and resource_requestctx.accept_mimetype == "application/json":
+            headers = resource_requestctx.response_handler.make_headers(
+                hits, 200, many=True
+            )
+            body = stream_with_context(hits.iter_json())
+            return Response(body, status=200, headers=headers), 200
         return hits.to_dict(), 200
 
     @request_extra_args
     @request_view_args
     @response_handler()
     def read(self):
-        """Read a specific log entry."""
-        item = self.service.read(
-            id_=resource_requestctx.view_args["id"],
+        """Read a specific log entry.
+
+        A client holding the current revision of the log, as told by the
+        ``If-None-Match`` header, gets a 304 without the log being read.
+        """
+        id_ = resource_requestctx.view_args["id"]
+        if request.if_none_match:
+            revision_id = self.service.read_revision_id(g.identity, id_)
+            if request.if_none_match.contains(audit_log_etag(id_, revision_id)):
+                return (
+                    Response(status=304, headers=cache_headers(id_, revision_id)),
+                    304,
+                )
+
+        item = self.service.read(id_=id_, identity=g.identity)
+        response = resource_requestctx.response_handler.make_response(
+            item.to_dict(), 200
+        )
+        response.headers.update(cache_headers(id_, item.revision_id))
+        return response, 200
+
+    @request_timeline_args
+    @request_view_args
+    @response_handler(many=True)
+    def read_timeline(self):
+        """Read the audit logs of a resource."""
+        timeline = self.service.read_timeline(
             identity=g.identity,
+            resource_type=resource_requestctx.view_args["resource_type"],
+            resource_id=resource_requestctx.view_args["resource_id"],
+            params=resource_requestctx.args,
         )
-        return item.to_dict(), 200
+        return timeline.to_dict(), 200
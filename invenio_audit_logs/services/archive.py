@@ -0,0 +1,420 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Cold archive of audit logs in compressed segment files."""
+
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timezone
+from uuid import UUID
+
+from invenio_db import db
+from invenio_search import current_search_client
+from invenio_search.engine import dsl
+from invenio_search.utils import prefix_index
+
+
+def _utc(date):
+    """Naive UTC date, as stored in the database."""
+    if date.tzinfo is not None:
+        date = date.astimezone(timezone.utc).replace(tzinfo=None)
+    return date
+
+
+class AuditLogArchive:
+    """Immutable segment files holding archived audit logs.
+
+    A segment is a file of concatenated frames, each holding the search dump
+    of an audit log as zlib-compressed JSON. Its sidecar index is a JSON file
+    with the time range of the segment and, for each log ordered by creation
+    date, its id, creation date and the offset and length of its frame.
+
+    Logs are looked up by id in a second, binary sidecar of each segment,
+    which is memory-mapped instead of loaded. It holds a Bloom filter of the
+    ids, which skips most segments without the log, and the frames sorted by
+    id behind a fanout table of their first byte, which are binary searched.
+    Only ``max_open`` sidecars are kept mapped, and the segments are listed
+    again at most every ``refresh_interval`` seconds, so that unknown ids do
+    not list the archive each time.
+    """
+
+    segment_extension = "seg"
+    index_extension = "idx.json"
+    ids_extension = "ids"
+
+    bloom_bits = 10
+    """Bits of the Bloom filter per log, for about 1% of false positives."""
+
+    bloom_hashes = 7
+    """Number of bits of the Bloom filter set per log."""
+
+    _segment_re = re.compile(r"^segment-(\d+)\.seg$")
+    _header = struct.Struct("<4sII")
+    _fanout = struct.Struct("<256I")
+    _entry = struct.Struct("<16sQI")
+    _magic = b"ALID"
+
+    def __init__(self, path, refresh_interval=1.0, max_open=128, timer=time.monotonic):
+        """Constructor."""
+        self.path = path
+        self._refresh_interval = refresh_interval
+        self._max_open = max_open
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._listing = None
+        self._listed_at = None
+        # Time range of the segments, by name
+        self._ranges = {}
+        # Memory-mapped id sidecars, least recently used first
+        self._sidecars = OrderedDict()
+
+    def _segment_path(self, name):
+        """Path of a segment file."""
+        return os.path.join(self.path, name)
+
+    def _sidecar_path(self, name, extension):
+        """Path of a sidecar of a segment."""
+        return self._segment_path(name)[: -len(self.segment_extension)] + extension
+
+    def _index_path(self, name):
+        """Path of the sidecar index of a segment."""
+        return self._sidecar_path(name, self.index_extension)
+
+    def _ids_path(self, name):
+        """Path of the id sidecar of a segment."""
+        return self._sidecar_path(name, self.ids_extension)
+
+    def _number(self, name):
+        """Number of a segment or of its temporary file."""
+        if name.endswith(".part"):
+            name = name[: -len(".part")]
+        match = self._segment_re.match(name)
+        return int(match.group(1)) if match else None
+
+    def segments(self):
+        """Names of the segments, in the order they were written."""
+        if not os.path.isdir(self.path):
+            return []
+        names = set(os.listdir(self.path))
+        # Segments are only complete once their index is written
+        return sorted(
+            name
+            for name in names
+            if self._segment_re.match(name)
+            and os.path.basename(self._index_path(name)) in names
+        )
+
+    def _current_segments(self):
+        """Names of the segments, listed at most every refresh interval."""
+        now = self._timer()
+        with self._lock:
+            if self._listing is None or now - self._listed_at >= self._refresh_interval:
+                self._listing = self.segments()
+                self._listed_at = now
+            return self._listing
+
+    def load_index(self, name):
+        """Load the sidecar index of a segment."""
+        with open(self._index_path(name)) as fp:
+            index = json.load(fp)
+        self._ranges[name] = (index["start"], index["end"])
+        return index
+
+    def _range(self, name):
+        """Time range of the logs of a segment."""
+        if name not in self._ranges:
+            self.load_index(name)
+        return self._ranges[name]
+
+    def write_segment(self, logs):
+        """Write a new segment.
+
+        The segment and its sidecars are written to temporary files and
+        renamed once synced to disk, the index last, so that an interrupted
+        write leaves no segment. The number of the segment is reserved by
+        exclusively creating its temporary file, so that concurrent writers
+        use different numbers.
+
+        :param logs: Search dumps of the logs, ordered by creation date.
+        :returns: Name of the segment.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        numbers = [self._number(name) for name in os.listdir(self.path)]
+        number = max((n for n in numbers if n is not None), default=-1) + 1
+        while True:
+            name = f"segment-{number:08d}.{self.segment_extension}"
+            path = self._segment_path(name)
+            try:
+                fd = os.open(f"{path}.part", os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+            except FileExistsError:
+                number += 1
+                continue
+            if not os.path.exists(path):
+                break
+            # Written meanwhile by another writer, since the listing
+            os.close(fd)
+            os.remove(f"{path}.part")
+            number += 1
+
+        entries = []
+        offset = 0
+        with os.fdopen(fd, "wb") as fp:
+            for log in logs:
+                frame = zlib.compress(json.dumps(log).encode("utf-8"))
+                fp.write(frame)
+                created = _utc(datetime.fromisoformat(log["@timestamp"])).isoformat()
+                entries.append([log["id"], created, offset, len(frame)])
+                offset += len(frame)
+            fp.flush()
+            os.fsync(fp.fileno())
+
+        index = {
+            "start": entries[0][1] if entries else None,
+            "end": entries[-1][1] if entries else None,
+            "logs": entries,
+        }
+        index_path = self._index_path(name)
+        with open(f"{index_path}.part", "w") as fp:
+            json.dump(index, fp)
+            fp.flush()
+            os.fsync(fp.fileno())
+
+        ids_path = self._ids_path(name)
+        with open(f"{ids_path}.part", "wb") as fp:
+            fp.write(self._build_ids(entries))
+            fp.flush()
+            os.fsync(fp.fileno())
+
+        os.replace(f"{path}.part", path)
+        os.replace(f"{ids_path}.part", ids_path)
+        os.replace(f"{index_path}.part", index_path)
+        with self._lock:
+            if self._listing is not None:
+                self._listing = sorted(self._listing + [name])
+        return name
+
+    #
+    # Lookup by id
+    #
+    def _bloom_positions(self, key, size):
+        """Bits of the Bloom filter of an id, from its random bytes."""
+        first, second = struct.unpack("<QQ", key)
+        second |= 1
+        return [(first + i * second) % size for i in range(self.bloom_hashes)]
+
+    def _build_ids(self, entries):
+        """Build the id sidecar of the entries of a segment index."""
+        frames = sorted(
+            (UUID(id_).bytes, offset, length) for id_, _, offset, length in entries
+        )
+        size = max(len(frames) * self.bloom_bits, 8)
+        bloom = bytearray((size + 7) // 8)
+        fanout = [0] * 256
+        for key, _, _ in frames:
+            for bit in self._bloom_positions(key, len(bloom) * 8):
+                bloom[bit >> 3] |= 1 << (bit & 7)
+            fanout[key[0]] += 1
+        for i in range(1, 256):
+            fanout[i] += fanout[i - 1]
+        return b"".join(
+            [
+                self._header.pack(self._magic, len(frames), len(bloom)),
+                bytes(bloom),
+                self._fanout.pack(*fanout),
+            ]
+            + [self._entry.pack(*frame) for frame in frames]
+        )
+
+    def _sidecar(self, name):
+        """Memory-mapped id sidecar of a segment."""
+        with self._lock:
+            buf = self._sidecars.get(name)
+            if buf is not None:
+                self._sidecars.move_to_end(name)
+                return buf
+        with open(self._ids_path(name), "rb") as fp:
+            buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        with self._lock:
+            self._sidecars[name] = buf
+            while len(self._sidecars) > self._max_open:
+                # Unmapped once no longer used by another lookup
+                self._sidecars.popitem(last=False)
+        return buf
+
+    def _find_frame(self, name, key):
+        """Frame of a log in a segment, as ``(offset, length)``, or ``None``."""
+        buf = self._sidecar(name)
+        _, count, bloom_size = self._header.unpack_from(buf)
+        start = self._header.size
+        for bit in self._bloom_positions(key, bloom_size * 8):
+            if not buf[start + (bit >> 3)] & (1 << (bit & 7)):
+                return None
+
+        fanout = self._fanout.unpack_from(buf, start + bloom_size)
+        entries = start + bloom_size + self._fanout.size
+        lo = fanout[key[0] - 1] if key[0] else 0
+        hi = fanout[key[0]]
+        size = self._entry.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry_key = buf[entries + mid * size : entries + mid * size + 16]
+            if entry_key < key:
+                lo = mid + 1
+            elif entry_key > key:
+                hi = mid
+            else:
+                _, offset, length = self._entry.unpack_from(buf, entries + mid * size)
+                return offset, length
+        return None
+
+    def _locate(self, ids):
+        """Segment and frame of archived logs, by id."""
+        keys = {}
+        for id_ in ids:
+            try:
+                keys[str(id_)] = UUID(str(id_)).bytes
+            except ValueError:
+                continue
+
+        frames = {}
+        # The most recent segments hold the logs most likely to be read
+        for name in reversed(self._current_segments()):
+            if len(frames) == len(keys):
+                break
+            for id_, key in keys.items():
+                if id_ not in frames:
+                    frame = self._find_frame(name, key)
+                    if frame is not None:
+                        frames[id_] = (name, *frame)
+        return frames
+
+    def __contains__(self, id_):
+        """Check if a log is archived, without reading it."""
+        return bool(self._locate([id_]))
+
+    def get(self, id_):
+        """Get the search dump of an archived log, or ``None``."""
+        return self.get_many([id_]).get(str(id_))
+
+    def get_many(self, ids):
+        """Get the search dumps of many archived logs.
+
+        Each segment is opened once.
+
+        :param ids: Ids of the logs.
+        :returns: Dictionary of the dumps of the archived logs, by id.
+        """
+        frames = {}
+        for name, offset, length in self._locate(ids).values():
+            frames.setdefault(name, []).append((offset, length))
+
+        dumps = {}
+        for name, segment_frames in frames.items():
+            for dump in self._read_frames(name, segment_frames):
+                dumps[dump["id"]] = dump
+        return dumps
+
+    def _read_frames(self, name, frames):
+        """Read frames of a segment, given as ``(offset, length)`` tuples."""
+        with open(self._segment_path(name), "rb") as fp:
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                for offset, length in frames:
+                    yield json.loads(zlib.decompress(buf[offset : offset + length]))
+
+    def iter_range(self, start=None, end=None):
+        """Iterate over the search dumps of the logs created in a time range.
+
+        Only the indexes of the segments overlapping the range are loaded.
+
+        :param datetime start: Include logs created on or after this date.
+        :param datetime end: Include logs created before this date.
+        """
+        start = _utc(start).isoformat() if start else None
+        end = _utc(end).isoformat() if end else None
+        for name in self.segments():
+            first_created, last_created = self._range(name)
+            if first_created is None:
+                continue
+            if (start and last_created < start) or (end and first_created >= end):
+                continue
+            logs = self.load_index(name)["logs"]
+            created = [log[1] for log in logs]
+            first = bisect_left(created, start) if start else 0
+            last = bisect_left(created, end) if end else len(created)
+            yield from self._read_frames(
+                name, [(log[2], log[3]) for log in logs[first:last]]
+            )
+
+
+class AuditLogArchiver:
+    """Move the audit logs older than a date to the archive.
+
+    Logs are archived in segments of ``segment_size`` logs, ordered by
+    creation date. Each segment is synced to disk before its logs are deleted
+    from the database and the search engine, in batches of ``batch_size``
+    logs, so that no log is lost if the archiving is interrupted.
+    """
+
+    def __init__(self, service, archive, segment_size=100000, batch_size=10000):
+        """Constructor."""
+        self._service = service
+        self._archive = archive
+        self._segment_size = segment_size
+        self._batch_size = batch_size
+
+    def run(self, before):
+        """Archive the logs created before a date.
+
+        :returns: Names of the written segments and number of archived logs.
+        """
+        record_cls = self._service.record_cls
+        model_cls = record_cls.model_cls
+        query = (
+            model_cls.query.filter(model_cls.created < before)
+            .order_by(model_cls.created, model_cls.id)
+            .limit(self._segment_size)
+        )
+
+        segments, archived = [], 0
+        while True:
+            models = query.all()
+            if not models:
+                break
+            name = self._archive.write_segment(
+                record_cls(m.data, model=m).dumps() for m in models
+            )
+            ids = [m.id for m in models]
+            for i in range(0, len(ids), self._batch_size):
+                batch = ids[i : i + self._batch_size]
+                model_cls.query.filter(model_cls.id.in_(batch)).delete(
+                    synchronize_session=False
+                )
+                db.session.commit()
+                self._delete_documents(batch)
+
+            segments.append(name)
+            archived += len(models)
+            if len(models) < self._segment_size:
+                break
+        return segments, archived
+
+    def _delete_documents(self, ids):
+        """Delete archived logs from the search engine."""
+        index = self._service.record_cls.index
+        dsl.Search(
+            using=current_search_client, index=prefix_index(index.search_alias)
+        ).filter("ids", values=[str(id_) for id_ in ids]).params(
+            conflicts="proceed"
+        ).delete()
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""In-process caches for audit logs."""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+
+class TTLCache:
+    """Bounded, thread-safe LRU cache with optional expiration of entries.
+
+    The least recently used entry is evicted once ``maxsize`` entries are
+    cached, and entries older than ``ttl`` seconds are treated as missing.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, timer=time.monotonic):
+        """Constructor."""
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._timer = timer
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        """Number of cached entries (including expired ones)."""
+        return len(self._data)
+
+    def __contains__(self, key):
+        """Check if a value is cached, without updating the statistics."""
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is None:
+            return False
+        expires_at = entry[1]
+        return expires_at is None or expires_at > self._timer()
+
+    @property
+    def stats(self):
+        """Cache statistics."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+    def get(self, key, default=None):
+        """Get a cached value."""
+        with self._lock:
+            try:
+                value, expires_at = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if expires_at is not None and expires_at <= self._timer():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Cache a value."""
+        expires_at = self._timer() + self._ttl if self._ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """Remove a cached value."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove all the cached values."""
+        with self._lock:
+            self._data.clear()
+
+
+class SearchResultCache:
+    """Cache of the search results of audit logs.
+
+    Audit logs are never updated, so the results of a search can only change
+    when logs are created in, or removed from, its time range. Time is split
+    in windows of ``window`` seconds, each with a generation counter which is
+    increased when a log is indexed in the window after it has closed (e.g.
+    when reindexing). The cache key of a search includes the generations of
+    the windows of its time range, so that such writes invalidate it.
+
+    A window is closed ``grace`` seconds after its end, once its last logs are
+    searchable. Searches whose time range ends in a closed window are cached
+    for ``past_ttl`` seconds (``0`` for no expiration). Other searches reach
+    the logs being written, and are cached for ``recent_ttl`` seconds instead,
+    so the logs of the open windows never need to invalidate the cache.
+    """
+
+    prefix = "auditlogs:search"
+
+    max_windows = 168
+    """Maximum number of windows of a search key, beyond which any late write
+    invalidates the search."""
+
+    def __init__(
+        self, cache, window=3600, recent_ttl=30, past_ttl=0, grace=60, timer=time.time
+    ):
+        """Constructor.
+
+        :param cache: Flask-Caching cache shared by the processes.
+        """
+        self._cache = cache
+        self._window = window
+        self._recent_ttl = recent_ttl
+        self._past_ttl = past_ttl
+        self._grace = grace
+        self._timer = timer
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        """Cache statistics."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _window_of(self, date, exclusive=False):
+        """Number of the window of a date.
+
+        :param exclusive: Whether the date is an excluded end of a time range,
+            so that a range ending with a window does not reach the next one.
+        """
+        if isinstance(date, str):
+            date = datetime.fromisoformat(date)
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        if exclusive:
+            date -= timedelta(microseconds=1)
+        return int(date.timestamp() // self._window)
+
+    def _open_window(self):
+        """Number of the first window which is not closed yet."""
+        return int((self._timer() - self._grace) // self._window)
+
+    def _generation_keys(self, start, end):
+        """Keys of the generation counters of a time range."""
+        if start is None or end - start > self.max_windows:
+            return [f"{self.prefix}:generation:late"]
+        return [
+            f"{self.prefix}:generation:{window}" for window in range(start, end + 1)
+        ]
+
+    def key(self, identity, params):
+        """Cache key and expiration of a search.
+
+        :param identity: Identity of the search, whose needs are part of the
+            key as they determine the permission filter.
+        :param params: Search parameters, once interpreted.
+        :returns: Tuple with the key and the time to live of the result.
+        """
+        open_window = self._open_window()
+        created_from = params.get("created_from")
+        created_to = params.get("created_to")
+
+        start = self._window_of(created_from) if created_from else None
+        end = self._window_of(created_to, exclusive=True) if created_to else open_window
+
+        generation_keys = [f"{self.prefix}:generation:epoch"]
+        if end < open_window:
+            ttl = self._past_ttl
+            generation_keys += self._generation_keys(start, end)
+        else:
+            ttl = self._recent_ttl
+        generations = self._cache.get_many(*generation_keys)
+
+        data = json.dumps(
+            {
+                "params": {k: v for k, v in params.items() if v is not None},
+                "needs": sorted(str(need) for need in identity.provides),
+                "generations": [generation or 0 for generation in generations],
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return f"{self.prefix}:{hashlib.sha1(data.encode()).hexdigest()}", ttl
+
+    def get(self, key):
+        """Get a cached search result."""
+        result = self._cache.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def set(self, key, result, ttl):
+        """Cache a search result."""
+        self._cache.set(key, result, timeout=ttl)
+
+    def record_write(self, created):
+        """Invalidate the searches of the window of a new log, if closed."""
+        window = self._window_of(created)
+        if window < self._open_window():
+            self._cache.inc(f"{self.prefix}:generation:{window}")
+            self._cache.inc(f"{self.prefix}:generation:late")
+
+    def invalidate(self):
+        """Invalidate all the cached searches, e.g. once logs are removed."""
+        self._cache.inc(f"{self.prefix}:generation:epoch")
@@ -8,7 +8,6 @@
 """Audit Logs Service Config."""
 
 from invenio_i18n import lazy_gettext as _
-from invenio_indexer.api import RecordIndexer
 from invenio_records_resources.services import pagination_links
 from invenio_records_resources.services.base import ServiceConfig
 from invenio_records_resources.services.base.config import ConfiguratorMixin, FromConfig
@@ -24,11 +23,17 @@ from invenio_records_resources.services.records.params import (
     SortParam,
 )
 from invenio_records_resources.services.records.queryparser import QueryParser
+from invenio_records_resources.services.records.results import (
+    RecordBulkItem,
+    RecordBulkList,
+)
 from sqlalchemy import asc, desc
 
-from ..proxies import current_audit_logs_actions_registry
+from ..actions import actions_registry
 from ..records import AuditLog
 from . import results
+from .indexer import AuditLogIndexer
+from .params import CursorParam, FiltersParam
 from .permissions import AuditLogPermissionPolicy
 from .schema import AuditLogSchema
 
@@ -71,9 +76,7 @@ class AuditLogSearchOptions(SearchOptionsBase):
         "action_name": TermsFacet(
             field="action",
             label="Action",
-            value_labels=lambda keys: {
-                k: current_audit_logs_actions_registry[k].name for k in keys
-            },
+            value_labels=actions_registry.labels,
         ),
         "user": TermsFacet(
             field="user.id",
@@ -86,12 +89,48 @@ class AuditLogSearchOptions(SearchOptionsBase):
 
     params_interpreters_cls = [
         QueryStrParam,
+        FiltersParam,
         SortParam,
         PaginationParam,
+        CursorParam,
         FacetsParam,
     ]
 
 
+def search_links(tpl):
+    """Create pagination links, following the cursor in cursor pagination."""
+
+    def next_vars(pagination, vars):
+        if isinstance(pagination, results.CursorPagination):
+            vars["args"].pop("page", None)
+            vars["args"]["after"] = pagination.next_cursor
+        else:
+            vars["args"]["page"] = pagination.next_page.page
+
+    return {
+        **pagination_links(tpl),
+        "next": Link(
+            tpl,
+            when=lambda pagination, ctx: pagination.has_next,
+            vars=next_vars,
+        ),
+    }
+
+
+def timeline_links(tpl):
+    """Create the links of a page of the audit logs of a resource."""
+    return {
+        "self": Link(tpl),
+        "next": Link(
+            tpl,
+            when=lambda pagination, ctx: pagination.has_next,
+            vars=lambda pagination, vars: vars["args"].update(
+                {"after": pagination.next_cursor}
+            ),
+        ),
+    }
+
+
 def idvar(log, vars):
     """Add domain into link vars."""
     vars["id"] = log.id
@@ -110,15 +149,40 @@ class AuditLogServiceConfig(ServiceConfig, ConfiguratorMixin):
     schema = AuditLogSchema
 
     record_cls = AuditLog
-    indexer_cls = RecordIndexer
+    indexer_cls = AuditLogIndexer
     indexer_queue_name = service_id
+    index_async = FromConfig("AUDIT_LOGS_INDEX_ASYNC", default=False)
+    buffer_events = FromConfig("AUDIT_LOGS_BUFFER_EVENTS", default=False)
+    user_cache_size = FromConfig("AUDIT_LOGS_USER_CACHE_SIZE", default=4096)
+    user_cache_ttl = FromConfig("AUDIT_LOGS_USER_CACHE_TTL", default=300)
+    read_cache_size = FromConfig("AUDIT_LOGS_READ_CACHE_SIZE", default=0)
+    read_cache_ttl = FromConfig("AUDIT_LOGS_READ_CACHE_TTL", default=300)
+    compiled_validation = FromConfig("AUDIT_LOGS_COMPILED_VALIDATION", default=False)
+    retention_rules = FromConfig("AUDIT_LOGS_RETENTION_RULES", default=[])
+    retention_batch_size = FromConfig("AUDIT_LOGS_RETENTION_BATCH_SIZE", default=10000)
+    search_cache_enabled = FromConfig("AUDIT_LOGS_SEARCH_CACHE_ENABLED", default=False)
+    search_cache_window = FromConfig("AUDIT_LOGS_SEARCH_CACHE_WINDOW", default=3600)
+    search_cache_recent_ttl = FromConfig(
+        "AUDIT_LOGS_SEARCH_CACHE_RECENT_TTL", default=30
+    )
+    search_cache_past_ttl = FromConfig("AUDIT_LOGS_SEARCH_CACHE_PAST_TTL", default=0)
+    search_cache_grace = FromConfig("AUDIT_LOGS_SEARCH_CACHE_GRACE", default=60)
+    archive_path = FromConfig("AUDIT_LOGS_ARCHIVE_PATH", default=None)
+    archive_segment_size = FromConfig("AUDIT_LOGS_ARCHIVE_SEGMENT_SIZE", default=100000)
     index_dumper = None
 
     components = []
     links_item = {
         "self": Link("{+api}/audit-logs/{id}", vars=idvar),
     }
-    links_search = pagination_links("{+api}/audit-logs{?args*}")
+    links_search = search_links("{+api}/audit-logs{?args*}")
+    links_timeline = timeline_links(
+        "{+api}/audit-logs/resources/{resource_type}/{resource_id}{?args*}"
+    )
 
     result_item_cls = results.AuditLogItem
     result_list_cls = results.AuditLogList
+    result_timeline_cls = results.AuditLogTimeline
+    result_record_list_cls = results.AuditLogRecordList
+    result_bulk_item_cls = RecordBulkItem
+    result_bulk_list_cls = RecordBulkList
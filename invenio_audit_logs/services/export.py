@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Export of audit logs to compressed files."""
+
+import csv
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+
+from invenio_db import db
+from sqlalchemy import and_, or_
+
+
+def _open_gzip(path):
+    """Open a gzip-compressed file for writing text."""
+    return gzip.open(path, "wt", encoding="utf-8", newline="")
+
+
+def _open_zstd(path):
+    """Open a zstd-compressed file for writing text."""
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError(
+            "The 'zstd' compression requires the 'zstandard' package, "
+            "install invenio-audit-logs[zstd]."
+        )
+    return zstandard.open(path, "wt", encoding="utf-8", newline="")
+
+
+def _parse_bound(value):
+    """Naive UTC date of an export bound, given as a date or in ISO format."""
+    if value is None or value == "":
+        return None
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid date: '{value}'")
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class NDJSONWriter:
+    """Write audit logs as newline-delimited JSON."""
+
+    extension = "ndjson"
+
+    def __init__(self, fp):
+        """Constructor."""
+        self._fp = fp
+
+    def write(self, log):
+        """Write an audit log."""
+        self._fp.write(json.dumps(log) + "\n")
+
+
+class CSVWriter:
+    """Write audit logs as CSV, with one column per field."""
+
+    extension = "csv"
+
+    columns = (
+        ("id", ("id",)),
+        ("created", ("created",)),
+        ("action", ("action",)),
+        ("resource.type", ("resource", "type")),
+        ("resource.id", ("resource", "id")),
+        ("user.id", ("user", "id")),
+        ("user.name", ("user", "name")),
+        ("user.email", ("user", "email")),
+    )
+
+    def __init__(self, fp):
+        """Constructor."""
+        self._writer = csv.writer(fp)
+        self._writer.writerow([name for name, _ in self.columns] + ["metadata"])
+
+    def write(self, log):
+        """Write an audit log."""
+        row = []
+        for _, path in self.columns:
+            value = log
+            for key in path:
+                value = (value or {}).get(key)
+            row.append(value)
+        row.append(json.dumps(log["metadata"]) if log.get("metadata") else None)
+        self._writer.writerow(row)
+
+
+class AuditLogExporter:
+    """Export audit logs to compressed files of fixed size.
+
+    The logs are read from the database ordered by creation date, with keyset
+    pagination so that memory usage does not depend on the size of the export.
+    They are written in chunks of ``chunk_size`` logs, and a checkpoint is
+    recorded in the output directory after each chunk, so that an interrupted
+    export can be resumed from the last complete chunk.
+    """
+
+    writers = {"ndjson": NDJSONWriter, "csv": CSVWriter}
+    openers = {"gzip": (_open_gzip, "gz"), "zstd": (_open_zstd, "zst")}
+
+    checkpoint_filename = "checkpoint.json"
+
+    def __init__(
+        self,
+        service,
+        output_dir,
+        fmt="ndjson",
+        compression="gzip",
+        chunk_size=100000,
+        batch_size=1000,
+    ):
+        """Constructor."""
+        if fmt not in self.writers:
+            raise ValueError(f"Unknown export format: '{fmt}'")
+        if compression not in self.openers:
+            raise ValueError(f"Unknown export compression: '{compression}'")
+
+        self._service = service
+        self._output_dir = output_dir
+        self._fmt = fmt
+        self._compression = compression
+        self._chunk_size = chunk_size
+        self._batch_size = min(batch_size, chunk_size)
+
+    @property
+    def checkpoint_path(self):
+        """Path of the checkpoint file."""
+        return os.path.join(self._output_dir, self.checkpoint_filename)
+
+    def run(
+        self,
+        identity,
+        created_from=None,
+        created_to=None,
+        user_id=None,
+        resource_type=None,
+        resource_id=None,
+        action=None,
+        resume=True,
+    ):
+        """Export the audit logs matching the filters.
+
+        :param identity: Identity used to dump the logs.
+        :param created_from: Export logs created on or after this date, as a
+            datetime or in ISO format.
+        :param created_to: Export logs created before this date.
+        :param resume: Resume from the checkpoint of a previous export.
+        :returns: The checkpoint of the export.
+        """
+        created_from = _parse_bound(created_from)
+        created_to = _parse_bound(created_to)
+        filters = {
+            "created_from": created_from.isoformat() if created_from else None,
+            "created_to": created_to.isoformat() if created_to else None,
+            "user_id": user_id,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "action": action,
+        }
+        os.makedirs(self._output_dir, exist_ok=True)
+        checkpoint = self._load_checkpoint(filters) if resume else None
+        if checkpoint is None:
+            checkpoint = {
+                "format": self._fmt,
+                "compression": self._compression,
+                "filters": filters,
+                "chunks": [],
+                "after": None,
+                "exported": 0,
+                "done": False,
+            }
+        if checkpoint["done"]:
+            return checkpoint
+
+        query = self._query(
+            created_from, created_to, user_id, resource_type, resource_id, action
+        )
+        schema = self._service.config.schema(context={"identity": identity})
+        logs = self._iter_logs(query, checkpoint["after"])
+
+        while True:
+            filename = self._chunk_filename(len(checkpoint["chunks"]))
+            count, last = self._write_chunk(filename, logs, schema)
+            if count:
+                checkpoint["chunks"].append(filename)
+                checkpoint["after"] = last
+                checkpoint["exported"] += count
+            checkpoint["done"] = count < self._chunk_size
+            self._save_checkpoint(checkpoint)
+            if checkpoint["done"]:
+                return checkpoint
+
+    def _query(
+        self, created_from, created_to, user_id, resource_type, resource_id, action
+    ):
+        """Query of the exported audit logs."""
+        model_cls = self._service.record_cls.model_cls
+        query = model_cls.query
+        if created_from:
+            query = query.filter(model_cls.created >= created_from)
+        if created_to:
+            query = query.filter(model_cls.created < created_to)
+        if user_id:
+            query = query.filter(model_cls.user_id == str(user_id))
+        if resource_type:
+            query = query.filter(model_cls.resource_type == resource_type)
+        if resource_id:
+            query = query.filter(model_cls.resource_id == str(resource_id))
+        if action:
+            query = query.filter(model_cls.action == action)
+        return query.order_by(model_cls.created, model_cls.id)
+
+    def _iter_logs(self, query, after):
+        """Iterate over the audit logs, one batch at a time.
+
+        :param after: Creation date and id of the log to start after.
+        """
+        model_cls = self._service.record_cls.model_cls
+        while True:
+            batch_query = query
+            if after:
+                created, id_ = datetime.fromisoformat(after[0]), after[1]
+                batch_query = batch_query.filter(
+                    or_(
+                        model_cls.created > created,
+                        and_(model_cls.created == created, model_cls.id > id_),
+                    )
+                )
+            batch = batch_query.limit(self._batch_size).all()
+            for model in batch:
+                # Keep the session from growing with the exported logs
+                db.session.expunge(model)
+                yield model
+            if len(batch) < self._batch_size:
+                return
+            after = (batch[-1].created.isoformat(), batch[-1].id)
+
+    def _chunk_filename(self, index):
+        """Name of a chunk file."""
+        extension = self.writers[self._fmt].extension
+        compression_extension = self.openers[self._compression][1]
+        return f"audit-logs-{index:05d}.{extension}.{compression_extension}"
+
+    def _write_chunk(self, filename, logs, schema):
+        """Write the next chunk of audit logs.
+
+        :returns: The number of written logs and the key of the last one.
+        """
+        path = os.path.join(self._output_dir, filename)
+        part_path = f"{path}.part"
+
+        count, last = 0, None
+        open_ = self.openers[self._compression][0]
+        with open_(part_path) as fp:
+            writer = self.writers[self._fmt](fp)
+            for model in logs:
+                record = self._service.record_cls(model.data, model=model)
+                writer.write(schema.dump(record))
+                count += 1
+                last = [model.created.isoformat(), str(model.id)]
+                if count == self._chunk_size:
+                    break
+
+        if count:
+            os.replace(part_path, path)
+        else:
+            os.remove(part_path)
+        return count, last
+
+    def _load_checkpoint(self, filters):
+        """Load the checkpoint of a previous export with the same parameters."""
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path) as fp:
+            checkpoint = json.load(fp)
+        if (
+            checkpoint["format"] != self._fmt
+            or checkpoint["compression"] != self._compression
+            or checkpoint["filters"] != filters
+        ):
+            raise ValueError(
+                "The output directory contains an export with different parameters."
+            )
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint):
+        """Atomically save the checkpoint."""
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(checkpoint, fp, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
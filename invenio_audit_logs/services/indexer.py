@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Audit Logs indexer."""
+
+from flask import current_app
+from invenio_indexer.api import RecordIndexer, bulk
+
+
+class AuditLogIndexer(RecordIndexer):
+    """Indexer for audit logs.
+
+    Audit logs are written to a data stream, which only accepts the ``create``
+    operation. Both the direct and the queue-based bulk indexing therefore use
+    ``create`` actions.
+
+    Indexed logs are reported to the search result cache given by the
+    service, so that logs written in past time windows invalidate the cached
+    searches.
+    """
+
+    search_cache = None
+    """Search result cache to report the indexed logs to, if any."""
+
+    def create(self, record, arguments=None, **kwargs):
+        """Index an audit log."""
+        self._record_written(record)
+        return super().create(record, arguments=arguments, **kwargs)
+
+    def bulk_create(self, records, arguments=None):
+        """Index many audit logs with a single bulk request.
+
+        :param records: Iterable of audit log records.
+        :param arguments: Arguments passed to the bulk request (e.g. refresh).
+        :returns: Tuple with the number of successful and failed actions.
+        """
+        arguments = arguments or {}
+        return bulk(
+            self.client,
+            (self._create_action(record) for record in records),
+            stats_only=True,
+            request_timeout=current_app.config["INDEXER_BULK_REQUEST_TIMEOUT"],
+            **arguments,
+        )
+
+    def bulk_create_by_id(self, record_id_iterator):
+        """Queue audit logs for bulk indexing.
+
+        :param record_id_iterator: Iterator yielding record UUIDs.
+        """
+        self._bulk_op(record_id_iterator, "create")
+
+    def _index_action(self, payload):
+        """Bulk action for a queued audit log.
+
+        :param payload: Decoded message body.
+        :returns: Dictionary defining the search engine bulk 'create' action.
+        """
+        return self._create_action(self.record_cls.get_record(payload["id"]))
+
+    def _create_action(self, record):
+        """Bulk create action.
+
+        :param record: Audit log record.
+        :returns: Dictionary defining the search engine bulk 'create' action.
+        """
+        self._record_written(record)
+        index = self.record_to_index(record)
+        body = self._prepare_record(record, index)
+
+        return {
+            "_op_type": "create",
+            "_index": self._prepare_index(index),
+            "_id": str(record.id),
+            "_source": body,
+        }
+
+    def _record_written(self, record):
+        """Report an indexed log to the search result cache."""
+        if self.search_cache is not None and record.created:
+            self.search_cache.record_write(record.created)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Audit Logs search parameter interpreters."""
+
+import base64
+import binascii
+import json
+from datetime import datetime, timezone
+from uuid import UUID
+
+from invenio_i18n import gettext as _
+from invenio_records_resources.services.errors import QuerystringValidationError
+from invenio_records_resources.services.records.params import ParamInterpreter
+
+
+def encode_cursor(sort_values):
+    """Encode the sort values of a hit into an opaque cursor."""
+    data = json.dumps(sort_values, separators=(",", ":")).encode()
+    # The padding is dropped to keep the cursor URL-safe
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decode a cursor into the sort values of a hit."""
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        sort_values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, UnicodeError, ValueError):
+        sort_values = None
+    if not isinstance(sort_values, list) or len(sort_values) != 2:
+        raise QuerystringValidationError(_("Invalid pagination cursor."))
+    return sort_values
+
+
+def decode_log_cursor(cursor):
+    """Decode a cursor into the creation date and id of a log."""
+    created, id_ = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(created), UUID(id_)
+    except (TypeError, ValueError):
+        raise QuerystringValidationError(_("Invalid pagination cursor."))
+
+
+class CursorParam(ParamInterpreter):
+    """Evaluate the 'after' parameter for cursor pagination.
+
+    The logs are sorted by ``@timestamp`` and ``id`` (newest first, unless the
+    ``oldest`` sort is selected) and the page starts after the log of the
+    cursor. An empty cursor returns the first page. Unlike the page number,
+    the cost of fetching a page does not depend on how deep it is.
+
+    Must be applied after the sort and pagination parameters.
+    """
+
+    def apply(self, identity, search, params):
+        """Evaluate the cursor on the search."""
+        cursor = params.get("after")
+        if cursor is None:
+            return search
+
+        order = "asc" if params.get("sort") == "oldest" else "desc"
+        search = search.sort(
+            {"@timestamp": {"order": order}},
+            {"id": {"order": order}},
+        )
+        search = search[: params["size"]]
+        if cursor:
+            search = search.extra(search_after=decode_cursor(cursor))
+        return search
+
+
+def parse_datetime(value):
+    """Parse a date of a query parameter, as a naive UTC date."""
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise QuerystringValidationError(
+                _("Invalid date '%(value)s'.", value=value)
+            )
+    # The logs are stored in UTC, and naive dates are taken to be in UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class FiltersParam(ParamInterpreter):
+    """Evaluate the typed filter parameters.
+
+    Each parameter is applied as a ``term`` filter on its field, and the
+    ``created_from`` (included) and ``created_to`` (excluded) dates as a
+    ``range`` filter on ``@timestamp``, in UTC. Filters do not affect the
+    score of the hits, so the search engine can cache them. Unlike
+    ``FilterParam``, the parameters are kept so that they are included in
+    the links of the other pages.
+    """
+
+    fields = {
+        "id": "id",
+        "action": "action",
+        "resource_type": "resource.type",
+        "resource_id": "resource.id",
+        "user_id": "user.id",
+    }
+
+    def apply(self, identity, search, params):
+        """Evaluate the filters on the search."""
+        for param, field in self.fields.items():
+            value = params.get(param)
+            if value:
+                search = search.filter("term", **{field: str(value)})
+
+        bounds = {}
+        for param, bound in (("created_from", "gte"), ("created_to", "lt")):
+            if params.get(param):
+                bounds[bound] = parse_datetime(params[param])
+                params[param] = bounds[bound].isoformat()
+        if not bounds:
+            return search
+        if "gte" in bounds and "lt" in bounds and bounds["gte"] >= bounds["lt"]:
+            raise QuerystringValidationError(
+                _("The start date must be before the end date.")
+            )
+
+        search = search.filter(
+            "range", **{"@timestamp": {k: v.isoformat() for k, v in bounds.items()}}
+        )
+        # Let the search engine skip the shards of the backing indices of the
+        # data stream outside of the time range, from their @timestamp bounds,
+        # before running the query on the other shards
+        return search.params(pre_filter_shard_size=1)
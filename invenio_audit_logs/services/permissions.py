@@ -22,3 +22,5 @@ class AuditLogPermissionPolicy(BasePermissionPolicy):
     can_read = [Administration(), SystemProcess()]
     can_update = [Disable()]
     can_delete = [Disable()]
+    can_purge = [SystemProcess()]
+    can_archive = [SystemProcess()]
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Parallel reindexing of audit logs."""
+
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from itertools import islice
+
+from invenio_db import db
+from sqlalchemy import func
+
+# Set in the worker processes
+_worker_app = None
+_worker_service = None
+
+
+def _init_worker(app, service):
+    """Initialize a forked worker process."""
+    global _worker_app, _worker_service
+    _worker_app, _worker_service = app, service
+    # The logs buffered by the parent process are persisted by the parent
+    service.write_behind = None
+    with app.app_context():
+        # The connections of the parent process must not be shared
+        db.engine.dispose(close=False)
+
+
+def _reindex_partition(start, end, batch_size):
+    """Index the audit logs created in a time range, in a worker process."""
+    with _worker_app.app_context():
+        return reindex_range(
+            _worker_service,
+            datetime.fromisoformat(start),
+            datetime.fromisoformat(end),
+            batch_size=batch_size,
+        )
+
+
+def reindex_range(service, start, end, batch_size=1000):
+    """Index the audit logs created in a time range.
+
+    The logs are streamed from the database with a server-side cursor and
+    indexed with one bulk request per batch. Logs that are already indexed are
+    reported as failed, as the data stream does not allow to overwrite them.
+
+    :returns: Tuple with the number of indexed and failed logs.
+    """
+    record_cls = service.record_cls
+    model_cls = record_cls.model_cls
+    models = (
+        model_cls.query.filter(model_cls.created >= start, model_cls.created < end)
+        .order_by(model_cls.created)
+        .yield_per(batch_size)
+    )
+
+    indexed = failed = 0
+    models = iter(models)
+    while True:
+        batch = [record_cls(m.data, model=m) for m in islice(models, batch_size)]
+        if not batch:
+            break
+        success, errors = service.indexer.bulk_create(
+            batch, arguments={"raise_on_error": False}
+        )
+        indexed += success
+        failed += errors
+        db.session.expunge_all()
+    return indexed, failed
+
+
+class AuditLogReindex:
+    """Rebuild the audit logs index from the database, in parallel.
+
+    The table is split in partitions by creation date, which are indexed by a
+    pool of worker processes. Completed partitions are recorded in an optional
+    checkpoint file, so that an interrupted reindex can be resumed. The
+    checkpoint also records the time range and interval of the partitions,
+    which a resumed reindex must use as well.
+    """
+
+    def __init__(
+        self,
+        app,
+        service,
+        workers=None,
+        interval=timedelta(days=7),
+        batch_size=1000,
+        checkpoint_path=None,
+    ):
+        """Constructor."""
+        self._app = app
+        self._service = service
+        self._workers = workers or os.cpu_count()
+        self._interval = interval
+        self._batch_size = batch_size
+        self._checkpoint_path = checkpoint_path
+        self._checkpoint = None
+
+    def partitions(self, created_from=None, created_to=None):
+        """Split the audit logs in time ranges.
+
+        :returns: List of ``(start, end)`` tuples, skipping the partitions of
+            the checkpoint.
+        :raises ValueError: If the checkpoint is of a reindex of another time
+            range or interval.
+        """
+        arguments = {
+            "created_from": created_from.isoformat() if created_from else None,
+            "created_to": created_to.isoformat() if created_to else None,
+            "interval": self._interval.total_seconds(),
+        }
+        checkpoint = self._load_checkpoint()
+        if checkpoint is not None:
+            if checkpoint["arguments"] != arguments:
+                raise ValueError(
+                    "The checkpoint is of a reindex of another time range or "
+                    "interval, resume it with the same arguments or remove it."
+                )
+            # The partitions are not shifted by the logs created meanwhile
+            start = datetime.fromisoformat(checkpoint["start"])
+            end = datetime.fromisoformat(checkpoint["end"])
+            done = set(checkpoint["done"])
+        else:
+            model_cls = self._service.record_cls.model_cls
+            first, last = db.session.query(
+                func.min(model_cls.created), func.max(model_cls.created)
+            ).one()
+            if first is None:
+                return []
+            start = max(first, created_from) if created_from else first
+            end = min(last + timedelta(microseconds=1), created_to or datetime.max)
+            done = set()
+            self._checkpoint = {
+                "arguments": arguments,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "done": [],
+            }
+            self._save_checkpoint()
+
+        partitions = []
+        while start < end:
+            partition_end = min(start + self._interval, end)
+            if start.isoformat() not in done:
+                partitions.append((start, partition_end))
+            start = partition_end
+        return partitions
+
+    def run(self, partitions):
+        """Index the partitions in parallel.
+
+        :returns: Iterator over the completed partitions, as
+            ``(start, end, indexed, failed)`` tuples.
+        """
+        write_behind = getattr(self._service, "write_behind", None)
+        if write_behind is not None:
+            # Persist the buffered logs before forking the workers
+            write_behind.flush()
+
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self._app, self._service),
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _reindex_partition,
+                    start.isoformat(),
+                    end.isoformat(),
+                    self._batch_size,
+                ): (start, end)
+                for start, end in partitions
+            }
+            for future in as_completed(futures):
+                start, end = futures[future]
+                indexed, failed = future.result()
+                if self._checkpoint is not None:
+                    self._checkpoint["done"].append(start.isoformat())
+                    self._save_checkpoint()
+                yield start, end, indexed, failed
+
+    def _load_checkpoint(self):
+        """Load the checkpoint of a previous reindex, if any."""
+        if not self._checkpoint_path or not os.path.exists(self._checkpoint_path):
+            return None
+        with open(self._checkpoint_path) as fp:
+            self._checkpoint = json.load(fp)
+        return self._checkpoint
+
+    def _save_checkpoint(self):
+        """Save the checkpoint."""
+        if not self._checkpoint_path:
+            return
+        tmp_path = f"{self._checkpoint_path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(self._checkpoint, fp)
+        os.replace(tmp_path, self._checkpoint_path)
@@ -7,9 +7,76 @@
 
 """Audit Logs Service Results."""
 
+import json
 from collections.abc import Iterable, Sized
 
+from invenio_records_resources.services.base.results import ServiceListResult
 from invenio_records_resources.services.records.results import RecordItem, RecordList
+from marshmallow import fields
+
+from ..actions import MessageRenderer
+from .params import encode_cursor
+from .schema import AuditLogSchema
+
+
+def _compile_projection(schema):
+    """Compile the fields dumped by a schema into a projection spec."""
+    spec = []
+    for name, field in schema.dump_fields.items():
+        nested = None
+        if isinstance(field, fields.Nested):
+            nested = _compile_projection(field.schema)
+        spec.append((field.attribute or name, field.data_key or name, nested))
+    return tuple(spec)
+
+
+def _project(source, spec):
+    """Project a search document according to a projection spec."""
+    projection = {}
+    for attribute, key, nested in spec:
+        value = source.get(attribute)
+        if value is None:
+            if attribute in source:
+                projection[key] = None
+        elif nested is not None:
+            projection[key] = _project(value, nested)
+        else:
+            projection[key] = value if type(value) is str else str(value)
+    return projection
+
+
+_hit_projection = _compile_projection(AuditLogSchema())
+
+
+def project_hit(hit):
+    """Project a search hit like ``AuditLogSchema().dump(hit)``.
+
+    All the fields of the schema are strings in the search document, including
+    ``@timestamp`` which the search dumper writes in ISO format. The document
+    can therefore be projected as is, without parsing and formatting the
+    timestamp again.
+    """
+    return _project(hit.to_dict(), _hit_projection)
+
+
+class CursorPagination:
+    """Pagination of a search using a cursor."""
+
+    has_prev = False
+
+    def __init__(self, size, next_cursor=None):
+        """Constructor.
+
+        :param size: Number of results per page.
+        :param next_cursor: Cursor of the next page, if any.
+        """
+        self.size = size
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        """True if there is a next page."""
+        return self.next_cursor is not None
 
 
 class AuditLogItem(RecordItem):
@@ -38,6 +105,11 @@ class AuditLogItem(RecordItem):
         """Get the result id."""
         return str(self._record.id)
 
+    @property
+    def revision_id(self):
+        """Get the revision of the log, e.g. for its entity tag."""
+        return self._record.revision_id
+
     @property
     def data(self):
         """Property to get the log."""
@@ -52,9 +124,9 @@ class AuditLogItem(RecordItem):
             },
         )
 
+        MessageRenderer().render(self._data)
         if self._links_tpl:
             self._data["links"] = self.links
-        # TODO: Add message rendering here later
 
         return self._data
 
@@ -79,19 +151,39 @@ class AuditLogList(RecordList):
         else:
             return None
 
+    @property
+    def pagination(self):
+        """Create a pagination object."""
+        if not self._params or self._params.get("after") is None:
+            return super().pagination
+
+        # The cursor of the next page is the sort values of the last hit
+        hits = self._results.hits
+        size = self._params["size"]
+        next_cursor = None
+        if len(hits) >= size:
+            next_cursor = encode_cursor(list(hits[-1].meta.sort))
+        return CursorPagination(size, next_cursor=next_cursor)
+
     @property
     def hits(self):
         """Iterator over the hits."""
+        fast_projection = self._schema.schema is AuditLogSchema
+        renderer = MessageRenderer()
         for hit in self.items:
             # Project the hit
-            projection = self._schema.dump(
-                hit,
-                context=dict(identity=self._identity, record=hit),
-            )
+            if fast_projection:
+                projection = project_hit(hit)
+            else:
+                projection = self._schema.dump(
+                    hit,
+                    context=dict(identity=self._identity, record=hit),
+                )
 
+            # Render the message, unless it was stored when indexed
+            renderer.render(projection)
             if self._links_item_tpl:
                 projection["links"] = self._links_item_tpl.expand(self._identity, hit)
-            # TODO: Add message rendering here later
 
             yield projection
 
@@ -113,3 +205,99 @@ class AuditLogList(RecordList):
                 res["links"] = self._links_tpl.expand(self._identity, self.pagination)
 
         return res
+
+    def iter_json(self, dumps=json.dumps):
+        """Encode the result as JSON, one hit at a time.
+
+        The encoded document is the same as ``to_dict()``, without building the
+        list of hits in memory.
+
+        :param dumps: Function encoding an object as JSON.
+        """
+        yield '{"hits": {"hits": ['
+        for i, hit in enumerate(self.hits):
+            yield dumps(hit) if i == 0 else ", " + dumps(hit)
+        yield f'], "total": {dumps(self.total)}}}'
+
+        if self.aggregations:
+            yield f', "aggregations": {dumps(self.aggregations)}'
+
+        if self._params:
+            yield f', "sortBy": {dumps(self._params["sort"])}'
+            if self._links_tpl:
+                links = self._links_tpl.expand(self._identity, self.pagination)
+                yield f', "links": {dumps(links)}'
+
+        yield "}"
+
+
+class AuditLogRecordList(ServiceListResult):
+    """List of audit logs read from the database."""
+
+    def __init__(self, service, identity, audit_logs, links_item_tpl=None):
+        """Constructor."""
+        self._service = service
+        self._identity = identity
+        self._results = audit_logs
+        self._links_item_tpl = links_item_tpl
+
+    def __len__(self):
+        """Number of audit logs."""
+        return len(self._results)
+
+    def __iter__(self):
+        """Iterator over the hits."""
+        return self.hits
+
+    @property
+    def hits(self):
+        """Iterator over the hits."""
+        schema = self._service.schema
+        renderer = MessageRenderer()
+        for audit_log in self._results:
+            projection = schema.dump(
+                audit_log,
+                context=dict(identity=self._identity, record=audit_log),
+            )
+            renderer.render(projection)
+            if self._links_item_tpl:
+                projection["links"] = self._links_item_tpl.expand(
+                    self._identity, audit_log
+                )
+            yield projection
+
+    def to_dict(self):
+        """Return result as a dictionary."""
+        return {"hits": {"hits": list(self.hits), "total": len(self)}}
+
+
+class AuditLogTimeline(AuditLogRecordList):
+    """Page of the audit logs of a resource, read from the database."""
+
+    def __init__(
+        self,
+        service,
+        identity,
+        audit_logs,
+        params,
+        links_tpl=None,
+        links_item_tpl=None,
+        next_cursor=None,
+    ):
+        """Constructor."""
+        super().__init__(service, identity, audit_logs, links_item_tpl=links_item_tpl)
+        self._params = params
+        self._links_tpl = links_tpl
+        self._next_cursor = next_cursor
+
+    @property
+    def pagination(self):
+        """Create a pagination object."""
+        return CursorPagination(self._params["size"], next_cursor=self._next_cursor)
+
+    def to_dict(self):
+        """Return result as a dictionary."""
+        res = {"hits": {"hits": list(self.hits)}}
+        if self._links_tpl:
+            res["links"] = self._links_tpl.expand(self._identity, self.pagination)
+        return res
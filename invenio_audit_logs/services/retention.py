@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Retention of audit logs."""
+
+import time
+from datetime import datetime
+
+from invenio_db import db
+from invenio_search import current_search_client
+from invenio_search.engine import dsl
+
+from ..records.datastream import AuditLogDataStream
+from ..records.partitions import AuditLogPartitionManager
+
+
+class AuditLogRetention:
+    """Purge the audit logs older than the maximum age of retention rules.
+
+    A rule is a dictionary with a ``max_age`` timedelta and optionally an
+    ``action`` and/or ``resource_type`` to which it is restricted. Rules are
+    independent: a log is purged as soon as it is older than the maximum age
+    of any rule it matches.
+
+    Expired logs are deleted from the database in batches of ``batch_size``
+    logs, each in its own transaction, and from the search engine with a
+    delete by query. For rules that apply to all the logs, whole partitions of
+    the table and backing indices of the data stream are dropped instead when
+    all their logs are expired.
+    """
+
+    def __init__(self, service, rules, batch_size=10000):
+        """Constructor."""
+        for rule in rules:
+            if not rule.get("max_age"):
+                raise ValueError(f"Retention rule without max age: {rule}")
+        self._service = service
+        self._rules = rules
+        self._batch_size = batch_size
+
+    def purge(self, now=None):
+        """Purge the expired audit logs.
+
+        :returns: Report with the number of purged logs per rule and the
+            duration of the purge in seconds.
+        """
+        now = now or datetime.utcnow()
+        start = time.monotonic()
+
+        report = {"rules": [], "deleted": 0, "duration": None}
+        for rule in self._rules:
+            cutoff = now - rule["max_age"]
+            filters = {
+                key: rule[key] for key in ("action", "resource_type") if key in rule
+            }
+            rule_start = time.monotonic()
+            rule_report = {
+                **filters,
+                "cutoff": cutoff.isoformat(),
+                "deleted": self._purge_database(cutoff, filters),
+                "deleted_documents": self._purge_index(cutoff, filters),
+            }
+            rule_report["duration"] = time.monotonic() - rule_start
+            report["rules"].append(rule_report)
+            report["deleted"] += rule_report["deleted"]
+
+        report["duration"] = time.monotonic() - start
+        return report
+
+    #
+    # Database
+    #
+    def _purge_database(self, cutoff, filters):
+        """Delete the expired logs from the database."""
+        deleted = 0
+        if not filters:
+            deleted += self._drop_partitions(cutoff)
+
+        model_cls = self._service.record_cls.model_cls
+        query = db.session.query(model_cls.id).filter(model_cls.created < cutoff)
+        for key, value in filters.items():
+            query = query.filter(getattr(model_cls, key) == value)
+        query = query.order_by(model_cls.created).limit(self._batch_size)
+
+        while True:
+            ids = [row.id for row in query]
+            if not ids:
+                break
+            model_cls.query.filter(model_cls.id.in_(ids)).delete(
+                synchronize_session=False
+            )
+            db.session.commit()
+            deleted += len(ids)
+            if len(ids) < self._batch_size:
+                break
+        return deleted
+
+    def _drop_partitions(self, cutoff):
+        """Drop the partitions of the table only holding expired logs."""
+        manager = AuditLogPartitionManager()
+        if not manager.is_partitioned():
+            return 0
+
+        # Estimated from the table statistics, as counting would scan them
+        deleted = sum(
+            manager.estimate_count(name)
+            for name, end in manager.list_partitions()
+            if end <= cutoff
+        )
+        manager.detach_partitions(cutoff, drop=True)
+        db.session.commit()
+        return deleted
+
+    #
+    # Search engine
+    #
+    def _purge_index(self, cutoff, filters):
+        """Delete the expired logs from the search engine."""
+        data_stream = AuditLogDataStream()
+        deleted = 0
+        if not filters:
+            deleted += self._drop_backing_indices(data_stream, cutoff)
+
+        # Only the backing indices holding expired logs are searched
+        indices = data_stream.indices_for_range(end=cutoff)
+        if not indices:
+            return deleted
+        search = dsl.Search(using=current_search_client, index=indices).filter(
+            "range", **{"@timestamp": {"lt": cutoff.isoformat()}}
+        )
+        if "action" in filters:
+            search = search.filter("term", action=filters["action"])
+        if "resource_type" in filters:
+            search = search.filter(
+                "term", **{"resource.type": filters["resource_type"]}
+            )
+
+        response = search.params(conflicts="proceed", slices="auto").delete()
+        return deleted + response.deleted
+
+    def _drop_backing_indices(self, data_stream, cutoff):
+        """Drop the backing indices of the data stream only holding expired logs."""
+        deleted = 0
+        # The write index of the data stream cannot be deleted
+        for index, _, last, count in data_stream.time_ranges()[:-1]:
+            if last is not None and last >= cutoff:
+                continue
+            data_stream.delete_index(index)
+            deleted += count
+        return deleted
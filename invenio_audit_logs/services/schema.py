@@ -98,10 +98,16 @@ class AuditLogSchema(Schema):
         description="Information about the user who triggered the event.",
     )
 
+    message = fields.Str(
+        dump_only=True,
+        description="Message of the action, if rendered when indexed.",
+    )
+
     @post_load
     def _lift_up_fields(self, json, **kwargs):
         """Lift up nested fields for DB insert."""
         json["resource_type"] = json["resource"].get("type")
+        json["resource_id"] = json["resource"].get("id")
         return json
 
     @pre_dump
@@ -9,18 +9,118 @@
 """Audit Logs Service API."""
 
 from datetime import datetime
+from uuid import UUID
 
 from invenio_access.permissions import system_identity
 from invenio_accounts.proxies import current_datastore
+from invenio_cache import current_cache
+from invenio_records_resources.errors import validation_error_to_list_errors
+from invenio_records_resources.services.base.links import LinksTemplate
 from invenio_records_resources.services.records import RecordService
 from invenio_records_resources.services.uow import unit_of_work
+from marshmallow import ValidationError
+from sqlalchemy import and_, or_
+from sqlalchemy.orm.exc import NoResultFound
 
-from .uow import AuditRecordCommitOp
+from .archive import AuditLogArchive, AuditLogArchiver
+from .cache import SearchResultCache, TTLCache
+from .export import AuditLogExporter
+from .params import decode_log_cursor, encode_cursor
+from .retention import AuditLogRetention
+from .uow import AuditRecordBufferOp, AuditRecordBulkCommitOp, AuditRecordCommitOp
+from .validator import CompiledSchemaWrapper, compiled_loader
 
 
 class AuditLogService(RecordService):
     """Audit log service layer."""
 
+    write_behind = None
+    """Optional write-behind buffer persisting the logs in the background."""
+
+    def __init__(self, config):
+        """Constructor."""
+        super().__init__(config)
+        self.user_cache = TTLCache(
+            maxsize=config.user_cache_size, ttl=config.user_cache_ttl
+        )
+        # Audit logs are never updated, but the cache of each process is only
+        # cleared when logs are purged in the same process
+        self.read_cache = (
+            TTLCache(maxsize=config.read_cache_size, ttl=config.read_cache_ttl)
+            if config.read_cache_size
+            else None
+        )
+        self._archive = None
+        self._search_cache = None
+
+    @property
+    def search_cache(self):
+        """Cache of the search results, if enabled."""
+        if not self.config.search_cache_enabled:
+            return None
+        # Kept across calls, as it holds the statistics of the cache
+        if self._search_cache is None:
+            self._search_cache = SearchResultCache(
+                current_cache,
+                window=self.config.search_cache_window,
+                recent_ttl=self.config.search_cache_recent_ttl,
+                past_ttl=self.config.search_cache_past_ttl,
+                grace=self.config.search_cache_grace,
+            )
+        return self._search_cache
+
+    @property
+    def indexer(self):
+        """Indexer of the audit logs, reporting them to the search cache."""
+        indexer = super().indexer
+        indexer.search_cache = self.search_cache
+        return indexer
+
+    @property
+    def archive(self):
+        """Archive of old audit logs, if configured."""
+        path = self.config.archive_path
+        if not path:
+            return None
+        # Kept across calls, as it caches the indexes of the segments
+        if self._archive is None or self._archive.path != path:
+            self._archive = AuditLogArchive(path)
+        return self._archive
+
+    @property
+    def schema(self):
+        """Returns the data schema instance."""
+        if self.config.compiled_validation:
+            return CompiledSchemaWrapper(self, schema=self.config.schema)
+        return super().schema
+
+    @staticmethod
+    def _user_data(user):
+        """Build the user fields stored on the audit log."""
+        user_blob = {"id": str(user.id), "email": user.email}
+        if user.username:
+            user_blob["name"] = user.username
+        return {"user": user_blob, "user_id": user.id}
+
+    def _resolve_user(self, identity):
+        """Resolve the user fields stored on the audit log."""
+        # TODO - to be changed to entity resolver
+        if identity.id == system_identity.id:
+            return {
+                "user": {
+                    "id": system_identity.id,
+                    "email": "system@system.org",
+                },  # TODO: Remove this after confirming system user email is passed
+                "user_id": system_identity.id,
+            }
+
+        key = str(identity.id)
+        user_data = self.user_cache.get(key)
+        if user_data is None:
+            user_data = self._user_data(current_datastore.get_user(identity.id))
+            self.user_cache.set(key, user_data)
+        return {"user": dict(user_data["user"]), "user_id": user_data["user_id"]}
+
     @unit_of_work()
     def create(self, identity, data, raise_errors=True, uow=None):
         """Create a record.
@@ -48,30 +148,36 @@ class AuditLogService(RecordService):
             raise_errors=raise_errors,
         )
 
-        # TODO - to be changed to entity resolver
-        if identity.id == system_identity.id:
-            data["user"] = {
-                "id": system_identity.id,
-                "email": "system@system.org",
-            }  # TODO: Remove this after confirming system user email is passed
-            data["user_id"] = system_identity.id
-        else:
-            user = current_datastore.get_user(identity.id)
-            user_blob = {"id": str(user.id), "email": user.email}
-            if user.username:
-                user_blob["name"] = user.username
-            data["user"] = user_blob
-            data["user_id"] = user.id
+        data.update(self._resolve_user(identity))
 
-        record = self.record_cls.create(
-            {},
-            **data,
-        )
-
-        # The user and session data is populated via component
-        self.run_components("create", identity=identity, record=record)
-        # Persist record (DB and index)
-        uow.register(AuditRecordCommitOp(record, self.indexer))
+        if self.write_behind is not None:
+            record = self.record_cls.build({}, **data)
+            # The user and session data is populated via component
+            self.run_components("create", identity=identity, record=record)
+            # Persist record (DB and index) in the background
+            self.write_behind.put(record)
+        elif self.config.buffer_events:
+            record = self.record_cls.build({}, **data)
+            # The user and session data is populated via component
+            self.run_components("create", identity=identity, record=record)
+            # Persist record (DB and index) with the other logs of the unit of work
+            buffer_op = AuditRecordBufferOp.get_or_register(
+                uow, indexer=self.indexer, index_async=self.config.index_async
+            )
+            buffer_op.add(record)
+        else:
+            record = self.record_cls.create(
+                {},
+                **data,
+            )
+            # The user and session data is populated via component
+            self.run_components("create", identity=identity, record=record)
+            # Persist record (DB and index)
+            uow.register(
+                AuditRecordCommitOp(
+                    record, self.indexer, index_async=self.config.index_async
+                )
+            )
 
         return self.result_item(
             self,
@@ -81,6 +187,134 @@ class AuditLogService(RecordService):
             errors=errors,
         )
 
+    @unit_of_work()
+    def create_many(self, identity, data, uow=None):
+        """Create many audit logs at once.
+
+        All valid logs are inserted with a single database flush and indexed
+        with a single bulk request. Invalid entries are reported in the result
+        instead of aborting the whole batch.
+
+        :param identity: Identity of user creating the logs.
+        :param data: Iterable of input data according to the data schema.
+        :param dict uow: Unit of Work.
+        """
+        if not self.config.enabled:
+            # don't create logs if feature disabled
+            return
+
+        self.require_permission(identity, "create")
+
+        # Resolved once, as all the logs are created by the same identity
+        user_data = self._resolve_user(identity)
+        created = datetime.utcnow().isoformat()
+        # A single schema instance validates the whole batch
+        schema = self.config.schema(context={"identity": identity})
+        load = (
+            compiled_loader(schema) if self.config.compiled_validation else schema.load
+        )
+
+        records = []
+        records_processed = []
+        for entry in data:
+            try:
+                # The input data of the caller is left untouched
+                entry_data = load({"created": created, **entry})
+            except ValidationError as e:
+                errors = validation_error_to_list_errors(e)
+                records_processed.append(("create", entry, errors, None))
+                continue
+
+            try:
+                entry_data.update(user_data)
+                record = self.record_cls.build({}, **entry_data)
+                # The user and session data is populated via component
+                self.run_components("create", identity=identity, record=record)
+                records.append(record)
+                records_processed.append(("create", record, [], None))
+            except Exception as exc:
+                records_processed.append(("create", entry, None, exc))
+
+        uow.register(
+            AuditRecordBulkCommitOp(
+                records, self.indexer, index_async=self.config.index_async
+            )
+        )
+
+        return self.result_bulk_list(self, identity, records_processed)
+
+    def export(
+        self,
+        identity,
+        output_dir,
+        fmt="ndjson",
+        compression="gzip",
+        chunk_size=100000,
+        resume=True,
+        **filters,
+    ):
+        """Export audit logs to compressed files.
+
+        :param identity: Identity of user exporting the logs.
+        :param output_dir: Directory of the exported files and checkpoint.
+        :param fmt: Format of the files, ``ndjson`` or ``csv``.
+        :param compression: Compression of the files, ``gzip`` or ``zstd``.
+        :param chunk_size: Number of logs per file.
+        :param resume: Resume an interrupted export from its checkpoint.
+        :param filters: Filters of the exported logs (``created_from``,
+            ``created_to``, ``user_id``, ``resource_type``, ``resource_id``
+            and ``action``).
+        :returns: The checkpoint of the export.
+        """
+        self.require_permission(identity, "search")
+
+        exporter = AuditLogExporter(
+            self,
+            output_dir,
+            fmt=fmt,
+            compression=compression,
+            chunk_size=chunk_size,
+        )
+        return exporter.run(identity, resume=resume, **filters)
+
+    def search(
+        self, identity, params=None, search_preference=None, expand=False, **kwargs
+    ):
+        """Search for audit logs, reusing the cached results if enabled."""
+        search_cache = self.search_cache
+        # The extra arguments (e.g. an extra filter) are not part of the key
+        if search_cache is None or kwargs:
+            return super().search(
+                identity,
+                params=params,
+                search_preference=search_preference,
+                expand=expand,
+                **kwargs,
+            )
+
+        self.require_permission(identity, "search")
+
+        params = params or {}
+        search = self._search("search", identity, params, search_preference, **kwargs)
+        key, ttl = search_cache.key(identity, params)
+        result = search_cache.get(key)
+        if result is None:
+            search_result = search.execute()
+            search_cache.set(key, search_result.to_dict(), ttl)
+        else:
+            search_result = search._response_class(search, result)
+
+        return self.result_list(
+            self,
+            identity,
+            search_result,
+            params,
+            links_tpl=LinksTemplate(self.config.links_search, context={"args": params}),
+            links_item_tpl=self.links_item_tpl,
+            expandable_fields=self.expandable_fields,
+            expand=expand,
+        )
+
     def read(
         self,
         identity,
@@ -91,7 +325,17 @@ class AuditLogService(RecordService):
         self.require_permission(identity, "read", user_identity=identity)
 
         # Read the record
-        log = self.record_cls.get_record(id_=id_)
+        log = self._read_cached(id_)
+        if log is None:
+            try:
+                log = self.record_cls.get_record(id_=id_)
+            except NoResultFound:
+                # Fall back to the archive of old logs
+                dump = self.archive.get(id_) if self.archive is not None else None
+                if dump is None:
+                    raise
+                log = self.record_cls.from_dump(dump)
+            self._cache_read(log)
 
         # Return the result
         return self.result_item(
@@ -101,6 +345,197 @@ class AuditLogService(RecordService):
             links_tpl=self.links_item_tpl,
         )
 
+    def read_revision_id(self, identity, id_):
+        """Get the current revision of an audit log, without reading its data.
+
+        Only the version of the log is read, by primary key, falling back to
+        the archive of old logs.
+        """
+        self.require_permission(identity, "read", user_identity=identity)
+        log = self._read_cached(id_)
+        if log is not None:
+            return log.revision_id
+
+        model_cls = self.record_cls.model_cls
+        version_id = (
+            model_cls.query.with_entities(model_cls.version_id)
+            .filter_by(id=id_)
+            .scalar()
+        )
+        if version_id is not None:
+            # Like the revision of a record, counted from 0
+            return version_id - 1
+
+        dump = self.archive.get(id_) if self.archive is not None else None
+        if dump is None:
+            raise NoResultFound()
+        return self.record_cls.from_dump(dump).revision_id
+
+    def read_many(self, identity, ids, fields=None, **kwargs):
+        """Read many audit logs at once, in the order of their ids.
+
+        The logs are read from the database with a single query, falling back
+        to the archive of old logs. Unknown ids are skipped.
+
+        :param identity: Identity of user reading the logs.
+        :param ids: Ids of the logs.
+        """
+        self.require_permission(identity, "read", user_identity=identity)
+
+        # The ids are normalized, so that any spelling of a UUID matches
+        uuids = []
+        for id_ in ids:
+            try:
+                uuids.append(id_ if isinstance(id_, UUID) else UUID(str(id_)))
+            except ValueError:
+                continue
+        ids = [str(id_) for id_ in uuids]
+
+        logs = {}
+        for id_ in ids:
+            log = self._read_cached(id_)
+            if log is not None:
+                logs[id_] = log
+
+        missing = {UUID(id_) for id_ in ids if id_ not in logs}
+        if missing:
+            model_cls = self.record_cls.model_cls
+            for model in model_cls.query.filter(model_cls.id.in_(missing)):
+                log = self.record_cls(model.data, model=model)
+                logs[str(model.id)] = log
+                missing.discard(model.id)
+                self._cache_read(log)
+
+        if missing and self.archive:
+            for id_, dump in self.archive.get_many(missing).items():
+                log = self.record_cls.from_dump(dump)
+                logs[id_] = log
+                self._cache_read(log)
+
+        return self.config.result_record_list_cls(
+            self,
+            identity,
+            [logs[id_] for id_ in ids if id_ in logs],
+            links_item_tpl=self.links_item_tpl,
+        )
+
+    def _read_cached(self, id_):
+        """Get an audit log from the read cache, or ``None``."""
+        if self.read_cache is None:
+            return None
+        dump = self.read_cache.get(str(id_))
+        return self.record_cls.from_dump(dump) if dump is not None else None
+
+    def _cache_read(self, log):
+        """Add an audit log to the read cache."""
+        if self.read_cache is not None:
+            self.read_cache.set(str(log.id), log.dumps())
+
+    def purge(self, identity, now=None):
+        """Purge the audit logs expired according to the retention rules.
+
+        :param identity: Identity of the purging process.
+        :returns: Report with the number of purged logs and the duration.
+        """
+        self.require_permission(identity, "purge")
+
+        retention = AuditLogRetention(
+            self,
+            self.config.retention_rules,
+            batch_size=self.config.retention_batch_size,
+        )
+        report = retention.purge(now=now)
+        if report["deleted"]:
+            if self.search_cache is not None:
+                self.search_cache.invalidate()
+            if self.read_cache is not None:
+                self.read_cache.clear()
+        return report
+
+    def archive_logs(self, identity, before):
+        """Move the audit logs created before a date to the archive.
+
+        :param identity: Identity of the archiving process.
+        :param datetime before: Archive the logs created before this date.
+        :returns: Names of the written segments and number of archived logs.
+        """
+        self.require_permission(identity, "archive")
+        if self.archive is None:
+            raise RuntimeError("The archive of audit logs is not configured.")
+
+        archiver = AuditLogArchiver(
+            self,
+            self.archive,
+            segment_size=self.config.archive_segment_size,
+            batch_size=self.config.retention_batch_size,
+        )
+        segments, archived = archiver.run(before)
+        if self.search_cache is not None and archived:
+            self.search_cache.invalidate()
+        return segments, archived
+
+    def read_timeline(self, identity, resource_type, resource_id, params=None):
+        """Read the audit logs of a resource, newest first.
+
+        The logs are read from the database with keyset pagination: the
+        ``after`` parameter is the cursor of the next page, given in the links
+        of the previous one.
+
+        :param identity: Identity of user reading the logs.
+        :param resource_type: Type of the resource.
+        :param resource_id: Id of the resource.
+        :param params: ``size`` and ``after`` pagination parameters.
+        """
+        self.require_permission(identity, "search")
+
+        params = dict(params or {})
+        pagination_options = self.config.search.pagination_options
+        size = params.setdefault("size", pagination_options["default_results_per_page"])
+
+        model_cls = self.record_cls.model_cls
+        query = model_cls.query.filter(
+            model_cls.resource_type == resource_type,
+            model_cls.resource_id == str(resource_id),
+        )
+        if params.get("after"):
+            created, id_ = decode_log_cursor(params["after"])
+            query = query.filter(
+                or_(
+                    model_cls.created < created,
+                    and_(model_cls.created == created, model_cls.id < id_),
+                )
+            )
+        # Fetch one more log to know if there is a next page
+        models = (
+            query.order_by(model_cls.created.desc(), model_cls.id.desc())
+            .limit(size + 1)
+            .all()
+        )
+
+        next_cursor = None
+        if len(models) > size:
+            models = models[:size]
+            next_cursor = encode_cursor(
+                [models[-1].created.isoformat(), str(models[-1].id)]
+            )
+
+        return self.config.result_timeline_cls(
+            self,
+            identity,
+            [self.record_cls(m.data, model=m) for m in models],
+            params,
+            links_tpl=LinksTemplate(
+                self.config.links_timeline,
+                context={
+                    "args": params,
+                    "resource_type": resource_type,
+                    "resource_id": resource_id,
+                },
+            ),
+            links_item_tpl=self.links_item_tpl,
+            next_cursor=next_cursor,
+        )
+
 
 class DisabledAuditLogService(AuditLogService):
     """Disabled Audit Log Service."""
@@ -108,3 +543,7 @@ class DisabledAuditLogService(AuditLogService):
     def create(self, *args, **kwargs):
         """Overridden create method."""
         return None
+
+    def create_many(self, *args, **kwargs):
+        """Overridden create many method."""
+        return None
@@ -8,14 +8,92 @@
 
 """Unit of work operations for audit logs."""
 
-from invenio_records_resources.services.uow import RecordCommitOp
+from weakref import WeakKeyDictionary
+
+from invenio_records_resources.services.uow import RecordBulkCommitOp, RecordCommitOp
 
 
 class AuditRecordCommitOp(RecordCommitOp):
     """Audit logging operation."""
 
+    def __init__(self, record, indexer=None, index_refresh=False, index_async=False):
+        """Initialize the audit log commit operation."""
+        super().__init__(record, indexer=indexer, index_refresh=index_refresh)
+        self._index_async = index_async
+
     def on_commit(self, uow):
         """Run the operation."""
         if self._indexer is not None:
+            if self._index_async:
+                return self._indexer.bulk_create_by_id([self._record.id])
             arguments = {"refresh": True} if self._index_refresh else {}
             return self._indexer.create(self._record, arguments)
+
+
+class AuditRecordBulkCommitOp(RecordBulkCommitOp):
+    """Audit logging bulk operation."""
+
+    def __init__(self, records, indexer=None, index_refresh=False, index_async=False):
+        """Initialize the audit log bulk commit operation."""
+        super().__init__(records, indexer=indexer, index_refresh=index_refresh)
+        self._index_async = index_async
+
+    def on_register(self, uow):
+        """Insert all records with a single flush."""
+        if self._records:
+            type(self._records[0]).insert_many(self._records)
+
+    def on_commit(self, uow):
+        """Index all records with a single bulk request."""
+        if self._indexer is not None and self._records:
+            if self._index_async:
+                return self._indexer.bulk_create_by_id(r.id for r in self._records)
+            arguments = {"refresh": True} if self._index_refresh else {}
+            return self._indexer.bulk_create(self._records, arguments)
+
+
+class AuditRecordBufferOp(AuditRecordBulkCommitOp):
+    """Audit logging operation buffering all the logs of a unit of work.
+
+    The buffered logs are only kept in memory until the unit of work commits.
+    They are then inserted with a single flush on the session of the unit of
+    work, committed, and indexed with a single bulk request. The logs are
+    therefore only written once the changes they audit are committed, and a
+    failure to insert them does not undo these changes. Only one buffer
+    operation is registered per unit of work.
+    """
+
+    _buffers = WeakKeyDictionary()
+
+    def __init__(self, indexer=None, index_refresh=False, index_async=False):
+        """Initialize the audit log buffer operation."""
+        super().__init__(
+            [], indexer=indexer, index_refresh=index_refresh, index_async=index_async
+        )
+
+    @classmethod
+    def get_or_register(cls, uow, **kwargs):
+        """Get the buffer operation of the unit of work, registering it if needed."""
+        op = cls._buffers.get(uow)
+        if op is None:
+            op = cls._buffers[uow] = cls(**kwargs)
+            uow.register(op)
+        return op
+
+    def add(self, record):
+        """Add a log built with ``AuditLog.build`` to the buffer."""
+        self._records.append(record)
+
+    def on_register(self, uow):
+        """Nothing to insert yet, the logs are inserted on commit."""
+
+    def on_commit(self, uow):
+        """Insert all the buffered logs at once, then index them."""
+        if self._records:
+            type(self._records[0]).insert_many(self._records, session=uow.session)
+            uow.session.commit()
+        return super().on_commit(uow)
+
+    def on_rollback(self, uow):
+        """Discard the buffered logs."""
+        self._records = []
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Compiled validation of audit log events.
+
+Marshmallow resolves the fields, hooks and error handling of a schema on every
+load. For the fixed structure of audit log events, the schema is compiled once
+into plain functions instead. The compiled validator only implements the happy
+path: as soon as the data is not valid, it gives up and the data is loaded with
+marshmallow, so that results and error messages are always identical.
+"""
+
+from collections.abc import Mapping
+from functools import lru_cache
+
+from invenio_records_resources.services.records.schema import ServiceSchemaWrapper
+from marshmallow import EXCLUDE, RAISE, fields, missing
+from marshmallow.decorators import POST_LOAD, PRE_LOAD, VALIDATES, VALIDATES_SCHEMA
+
+
+class InvalidData(Exception):
+    """Data that the compiled validator cannot load."""
+
+
+class UnsupportedSchema(Exception):
+    """Schema that cannot be compiled."""
+
+
+def _has_hooks(schema, tag):
+    """Check if a schema declares hooks of the given type."""
+    return any(
+        hooks and (key == tag or (isinstance(key, tuple) and key[0] == tag))
+        for key, hooks in schema._hooks.items()
+    )
+
+
+def _compile_field(field):
+    """Compile a field into a function deserializing its value."""
+    if isinstance(field, fields.Nested):
+        if field.many or field.only or field.exclude:
+            raise UnsupportedSchema(f"Unsupported nested field: {field}")
+        load_nested = _compile_schema(field.schema)
+
+        def load(value, key, data):
+            if not isinstance(value, Mapping):
+                raise InvalidData(key)
+            return load_nested(value)
+
+    elif type(field) in (fields.String, fields.Email):
+        validators = tuple(field.validators)
+
+        def load(value, key, data):
+            if not isinstance(value, str):
+                raise InvalidData(key)
+            for validator in validators:
+                validator(value)
+            return value
+
+    else:
+
+        def load(value, key, data):
+            return field.deserialize(value, key, data)
+
+    return load
+
+
+def _compile_schema(schema):
+    """Compile a schema instance into a function loading its data."""
+    if schema.unknown not in (EXCLUDE, RAISE):
+        raise UnsupportedSchema(f"Unsupported unknown policy: {schema.unknown}")
+    for tag in (PRE_LOAD, VALIDATES, VALIDATES_SCHEMA):
+        if _has_hooks(schema, tag):
+            raise UnsupportedSchema(f"Unsupported {tag} hook on {schema}")
+
+    load_fields = []
+    for name, field in schema.load_fields.items():
+        default = field.load_default
+        if default is not missing and not field.required:
+            raise UnsupportedSchema(f"Unsupported load default on {name}")
+        load_fields.append(
+            (
+                field.data_key or name,
+                field.attribute or name,
+                field.required,
+                field.allow_none,
+                _compile_field(field),
+            )
+        )
+    load_fields = tuple(load_fields)
+    known_keys = frozenset(key for key, *_ in load_fields)
+    raise_unknown = schema.unknown == RAISE
+    post_load = _has_hooks(schema, POST_LOAD)
+
+    def load(data):
+        if raise_unknown and not known_keys.issuperset(data):
+            raise InvalidData("unknown")
+
+        result = {}
+        for key, attribute, required, allow_none, load_field in load_fields:
+            value = data.get(key, missing)
+            if value is missing:
+                if required:
+                    raise InvalidData(key)
+                continue
+            if value is None:
+                if not allow_none:
+                    raise InvalidData(key)
+                result[attribute] = None
+                continue
+            result[attribute] = load_field(value, key, data)
+
+        if post_load:
+            result = schema._invoke_load_processors(
+                POST_LOAD, result, many=False, original_data=data, partial=None
+            )
+        return result
+
+    return load
+
+
+@lru_cache(maxsize=None)
+def compile_schema(schema_cls):
+    """Compile a schema class into a function loading its data.
+
+    The function raises ``InvalidData`` when it cannot load the data, in which
+    case the data should be loaded with the schema itself. Schema hooks are
+    run on a shared instance, so post-load hooks must not rely on the context.
+
+    :returns: The compiled function or ``None`` if the schema is not supported.
+    """
+    try:
+        return _compile_schema(schema_cls())
+    except UnsupportedSchema:
+        return None
+
+
+def compiled_loader(schema):
+    """Get a function loading data with the compiled schema when possible.
+
+    :param schema: Schema instance used when the compiled schema cannot load
+        the data.
+    """
+    compiled_load = compile_schema(type(schema))
+    if compiled_load is None:
+        return schema.load
+
+    def load(data):
+        try:
+            return compiled_load(data)
+        except Exception:
+            # Let marshmallow report the errors
+            return schema.load(data)
+
+    return load
+
+
+class CompiledSchemaWrapper(ServiceSchemaWrapper):
+    """Schema wrapper loading the data with the compiled schema when possible."""
+
+    def __init__(self, service, schema):
+        """Constructor."""
+        super().__init__(service, schema)
+        self._compiled_load = compile_schema(schema)
+
+    def load(self, data, schema_args=None, context=None, raise_errors=True):
+        """Load data with the compiled schema, or fall back to marshmallow."""
+        if self._compiled_load is not None and not schema_args:
+            try:
+                return self._compiled_load(data), []
+            except Exception:
+                # Let marshmallow report the errors
+                pass
+        return super().load(
+            data, schema_args=schema_args, context=context, raise_errors=raise_errors
+        )
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Write-behind pipeline for audit logs."""
+
+import atexit
+import json
+import os
+import threading
+from collections import Counter, deque
+from datetime import datetime
+from itertools import islice
+from uuid import UUID
+
+from invenio_records_resources.services.uow import UnitOfWork
+
+from .uow import AuditRecordBulkCommitOp
+
+
+class AuditLogWriteBehind:
+    """Bounded in-memory buffer persisting audit logs in the background.
+
+    Audit logs built by the service are put in the buffer and a background
+    flusher thread inserts and indexes them in batches, either once
+    ``batch_size`` logs are waiting or every ``flush_interval`` seconds.
+
+    When the buffer is full, the ``overflow_policy`` decides what happens:
+
+    - ``block``: wait until the flusher makes room in the buffer.
+    - ``drop_oldest``: discard the oldest buffered log.
+    - ``spill``: append the log to ``spill_path``, which the flusher ingests
+      once the buffer is drained.
+    """
+
+    overflow_policies = ("block", "drop_oldest", "spill")
+
+    def __init__(
+        self,
+        app,
+        service,
+        max_size=10000,
+        batch_size=500,
+        flush_interval=1.0,
+        overflow_policy="block",
+        spill_path=None,
+    ):
+        """Constructor."""
+        if overflow_policy not in self.overflow_policies:
+            raise ValueError(f"Unknown overflow policy: '{overflow_policy}'")
+        if overflow_policy == "spill" and not spill_path:
+            raise ValueError("The 'spill' overflow policy requires a spill path.")
+
+        self._app = app
+        self._service = service
+        self._max_size = max_size
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._overflow_policy = overflow_policy
+        self._spill_path = spill_path
+
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._spill_lock = threading.Lock()
+        self._ingest_lock = threading.Lock()
+        self._counters_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._closed = False
+        self._counters = Counter(enqueued=0, flushed=0, dropped=0, spilled=0)
+
+    @classmethod
+    def from_config(cls, app, service):
+        """Create the write-behind buffer from the application config."""
+        return cls(
+            app,
+            service,
+            max_size=app.config["AUDIT_LOGS_WRITE_BEHIND_MAX_SIZE"],
+            batch_size=app.config["AUDIT_LOGS_WRITE_BEHIND_BATCH_SIZE"],
+            flush_interval=app.config["AUDIT_LOGS_WRITE_BEHIND_FLUSH_INTERVAL"],
+            overflow_policy=app.config["AUDIT_LOGS_WRITE_BEHIND_OVERFLOW_POLICY"],
+            spill_path=app.config["AUDIT_LOGS_WRITE_BEHIND_SPILL_PATH"],
+        )
+
+    @property
+    def counters(self):
+        """Number of enqueued, flushed, dropped and spilled audit logs."""
+        with self._counters_lock:
+            return dict(self._counters)
+
+    def _count(self, name, value=1):
+        """Increment a counter, from any thread."""
+        with self._counters_lock:
+            self._counters[name] += value
+
+    def put(self, record):
+        """Put an audit log created with ``AuditLog.build`` in the buffer."""
+        # Keep the time of the event rather than the time of the flush
+        now = datetime.utcnow()
+        record.model.created = record.model.created or now
+        record.model.updated = record.model.updated or now
+
+        self._ensure_started()
+        with self._cond:
+            if len(self._buffer) >= self._max_size:
+                if self._overflow_policy == "block":
+                    self._cond.wait_for(lambda: len(self._buffer) < self._max_size)
+                elif self._overflow_policy == "drop_oldest":
+                    self._buffer.popleft()
+                    self._count("dropped")
+                else:
+                    self._spill([record])
+                    return
+
+            self._buffer.append(record)
+            self._count("enqueued")
+            if len(self._buffer) >= self._batch_size:
+                self._cond.notify_all()
+
+    def flush(self):
+        """Persist all the buffered audit logs."""
+        while True:
+            batch = self._pop_batch()
+            if not batch:
+                break
+            self._write(batch)
+        self._ingest_spill()
+
+    def close(self):
+        """Stop the flusher thread and persist the remaining audit logs."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        atexit.unregister(self.close)
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join()
+        self.flush()
+
+    #
+    # Flusher
+    #
+    def _ensure_started(self):
+        """Start the flusher thread, also in forked worker processes."""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._cond:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            if self._thread is None:
+                # Persist the remaining logs on exit, once the flusher runs
+                atexit.register(self.close)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name="audit-logs-write-behind", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        """Flusher thread loop."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._buffer) >= self._batch_size,
+                    timeout=self._flush_interval,
+                )
+                closed = self._closed
+            if closed:
+                return
+            self.flush()
+
+    def _pop_batch(self):
+        """Pop a batch of audit logs from the buffer."""
+        with self._cond:
+            size = min(self._batch_size, len(self._buffer))
+            batch = [self._buffer.popleft() for _ in range(size)]
+            self._cond.notify_all()
+        return batch
+
+    def _write(self, records):
+        """Insert and index a batch of audit logs.
+
+        Logs which fail to be inserted are spilled, if possible, or dropped.
+        Logs which are inserted but fail to be indexed are queued for
+        asynchronous indexing instead, as inserting them again would fail.
+        """
+        with self._app.app_context():
+            try:
+                with UnitOfWork() as uow:
+                    uow.register(AuditRecordBulkCommitOp(records))
+                    uow.commit()
+            except Exception:
+                self._app.logger.exception("Failed to write audit logs.")
+                if self._spill_path:
+                    self._spill(records)
+                else:
+                    self._count("dropped", len(records))
+                return
+
+            self._count("flushed", len(records))
+            self._index(records)
+
+    def _index(self, records):
+        """Index a batch of inserted audit logs."""
+        indexer = self._service.indexer
+        try:
+            if self._service.config.index_async:
+                indexer.bulk_create_by_id(record.id for record in records)
+            else:
+                indexer.bulk_create(records)
+        except Exception:
+            self._app.logger.exception("Failed to index audit logs, queueing them.")
+            try:
+                indexer.bulk_create_by_id(record.id for record in records)
+            except Exception:
+                # The logs are in the database, and indexed again by a reindex
+                self._app.logger.exception("Failed to queue audit logs.")
+
+    def _unwritten(self, records):
+        """Audit logs of a batch which are not in the database yet.
+
+        The logs of a spill file may already be inserted, if its ingestion was
+        interrupted before recording their offset.
+        """
+        model_cls = self._service.record_cls.model_cls
+        ids = [record.id for record in records]
+        query = model_cls.query.with_entities(model_cls.id)
+        written = {id_ for (id_,) in query.filter(model_cls.id.in_(ids))}
+        return [record for record in records if record.id not in written]
+
+    #
+    # Spill file
+    #
+    def _spill(self, records):
+        """Append audit logs to the spill file."""
+        with self._spill_lock:
+            with open(self._spill_path, "a") as fp:
+                for record in records:
+                    fp.write(json.dumps(self._dump(record)) + "\n")
+        self._count("spilled", len(records))
+
+    def _ingest_spill(self):
+        """Persist the audit logs of the spill file.
+
+        The spill file is renamed before being read, so that new logs are
+        spilled to a new file meanwhile. It is read by batches, recording the
+        offset of the logs already written, and only removed once all of its
+        logs are written. A file left by an interrupted ingestion is resumed.
+        """
+        if not self._spill_path:
+            return
+        processing_path = f"{self._spill_path}.processing"
+        offset_path = f"{processing_path}.offset"
+        with self._ingest_lock:
+            with self._spill_lock:
+                if not os.path.exists(processing_path):
+                    if not os.path.exists(self._spill_path):
+                        return
+                    os.replace(self._spill_path, processing_path)
+
+            offset = 0
+            if os.path.exists(offset_path):
+                with open(offset_path) as fp:
+                    offset = int(fp.read() or 0)
+
+            with open(processing_path, "rb") as fp:
+                fp.seek(offset)
+                while True:
+                    lines = [line for line in islice(fp, self._batch_size) if line]
+                    if not lines:
+                        break
+                    with self._app.app_context():
+                        records = [self._load(json.loads(line)) for line in lines]
+                        records = self._unwritten(records)
+                    if records:
+                        self._write(records)
+                    self._save_offset(offset_path, fp.tell())
+
+            os.remove(processing_path)
+            if os.path.exists(offset_path):
+                os.remove(offset_path)
+
+    @staticmethod
+    def _save_offset(path, offset):
+        """Atomically record the offset of the spilled logs already written."""
+        with open(f"{path}.part", "w") as fp:
+            fp.write(str(offset))
+        os.replace(f"{path}.part", path)
+
+    @staticmethod
+    def _dump(record):
+        """Serialize an audit log for the spill file."""
+        model = record.model
+        return {
+            "id": str(model.id),
+            "created": model.created.isoformat(),
+            "action": model.action,
+            "resource_type": model.resource_type,
+            "resource_id": model.resource_id,
+            "user_id": model.user_id,
+            "json": model.json,
+        }
+
+    def _load(self, entry):
+        """Rebuild an audit log from the spill file."""
+        record = self._service.record_cls.build(
+            entry["json"],
+            id_=UUID(entry["id"]),
+            action=entry["action"],
+            resource_type=entry["resource_type"],
+            resource_id=entry["resource_id"],
+            user_id=entry["user_id"],
+        )
+        record.model.created = datetime.fromisoformat(entry["created"])
+        record.model.updated = record.model.created
+        return record
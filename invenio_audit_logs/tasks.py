@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Celery tasks for audit logs."""
+
+from celery import shared_task
+from flask import current_app
+from invenio_access.permissions import system_identity
+from invenio_db import db
+
+from .proxies import current_audit_logs_service
+from .records.partitions import AuditLogPartitionManager
+
+
+@shared_task(ignore_result=True)
+def process_audit_logs_queue(search_bulk_kwargs=None, bulk_index_max_items=None):
+    """Index the audit logs queued for asynchronous indexing.
+
+    :param dict search_bulk_kwargs: Passed to `search.helpers.bulk`.
+    :param int bulk_index_max_items: max number of logs to consume per task.
+    """
+    current_audit_logs_service.indexer.process_bulk_queue(
+        search_bulk_kwargs=search_bulk_kwargs,
+        bulk_index_max_items=bulk_index_max_items,
+    )
+
+
+@shared_task(ignore_result=True)
+def create_audit_logs_partitions(months_ahead=None):
+    """Create the missing partitions of the audit logs table, if partitioned.
+
+    :param int months_ahead: Number of months to create partitions for.
+    """
+    manager = AuditLogPartitionManager()
+    if not manager.is_partitioned():
+        return
+    if months_ahead is None:
+        months_ahead = current_app.config["AUDIT_LOGS_PARTITIONS_MONTHS_AHEAD"]
+    manager.create_partitions(months_ahead=months_ahead)
+    db.session.commit()
+
+
+@shared_task(ignore_result=True)
+def purge_audit_logs():
+    """Purge the audit logs expired according to the retention rules."""
+    report = current_audit_logs_service.purge(system_identity)
+    current_app.logger.info(
+        "Purged %s audit logs in %.1fs.", report["deleted"], report["duration"]
+    )
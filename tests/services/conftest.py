@@ -17,10 +17,14 @@ from invenio_access.permissions import authenticated_user
 from invenio_app.factory import create_api
 from invenio_search import current_search
 
+from invenio_audit_logs.actions import actions_registry
+
 
 @pytest.fixture(scope="module")
 def create_app(instance_path, entry_points):
     """Application factory fixture."""
+    # Load the actions of the mocked entrypoints
+    actions_registry.reset()
     return create_api
 
 
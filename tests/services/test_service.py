@@ -5,12 +5,24 @@
 # Invenio-Audit-Logs is free software; you can redistribute it and/or modify
 # it under the terms of the MIT License; see LICENSE file for more details.
 
+import gzip
+import json
+from datetime import datetime, timedelta
+from uuid import uuid4
+
 import pytest
 from flask import g
 from invenio_access.permissions import system_identity, system_user_id
+from invenio_accounts.proxies import current_datastore
 from invenio_records_resources.services.errors import PermissionDeniedError
+from invenio_records_resources.services.records.components import ServiceComponent
+from invenio_records_resources.services.uow import UnitOfWork
+from sqlalchemy.orm.exc import NoResultFound
 
 from invenio_audit_logs.proxies import current_audit_logs_service
+from invenio_audit_logs.services.reindex import AuditLogReindex, reindex_range
+from invenio_audit_logs.services.writebehind import AuditLogWriteBehind
+from invenio_audit_logs.tasks import process_audit_logs_queue
 
 
 @pytest.fixture
@@ -72,3 +84,400 @@ def test_audit_log_create_system_identity(app, db, service, resource_data):
         assert result["resource"]["id"] == "abcd-1234"
         assert result["resource"]["type"] == "record"
         assert result["user"]["id"] == system_user_id
+
+
+def test_audit_log_create_many(app, db, service, resource_data, monkeypatch):
+    """Should create the valid logs and report errors for the invalid ones."""
+    created = []
+
+    class CreateComponent(ServiceComponent):
+        def create(self, identity, record=None, **kwargs):
+            created.append(record.id)
+
+    monkeypatch.setattr(service.config, "components", [CreateComponent])
+    invalid_data = dict(action="draft.create")  # missing resource
+    data = [dict(resource_data), invalid_data, dict(resource_data)]
+    with app.test_request_context():
+        result = service.create_many(identity=system_identity, data=data)
+
+        results = list(result.results)
+        assert len(results) == 3
+        assert [bool(r.errors) for r in results] == [False, True, False]
+        assert results[1].errors[0]["field"] == "resource"
+        # The components run for each log, and the input data is not changed
+        assert created == [results[0].record.id, results[2].record.id]
+        assert not any("created" in entry for entry in data)
+
+        log = service.read(identity=system_identity, id_=results[0].record.id)
+        assert log["action"] == "draft.create"
+        assert log["resource"]["id"] == "abcd-1234"
+        assert log["user"]["id"] == system_user_id
+
+
+def test_audit_log_create_async(app, db, service, resource_data, monkeypatch):
+    """Should queue the logs for indexing, and index them with the task."""
+    monkeypatch.setitem(app.config, "AUDIT_LOGS_INDEX_ASYNC", True)
+    indexer_cls = service.config.indexer_cls
+
+    def fail(*args, **kwargs):
+        pytest.fail("The logs are indexed in the request.")
+
+    published = []
+    bulk_op = indexer_cls._bulk_op
+
+    def _bulk_op(self, record_id_iterator, op_type, index=None):
+        ids = [str(id_) for id_ in record_id_iterator]
+        published.append((op_type, ids))
+        return bulk_op(self, ids, op_type, index=index)
+
+    monkeypatch.setattr(indexer_cls, "create", fail)
+    monkeypatch.setattr(indexer_cls, "bulk_create", fail)
+    monkeypatch.setattr(indexer_cls, "_bulk_op", _bulk_op)
+    with app.test_request_context():
+        log = service.create(identity=system_identity, data=dict(resource_data))
+        logs = service.create_many(
+            identity=system_identity, data=[dict(resource_data) for _ in range(2)]
+        )
+    ids = [str(r.record.id) for r in logs.results]
+    assert published == [("create", [log.id]), ("create", ids)]
+
+    actions = []
+    index_action = indexer_cls._index_action
+
+    def _index_action(self, payload):
+        action = index_action(self, payload)
+        actions.append(action)
+        return action
+
+    monkeypatch.setattr(indexer_cls, "_index_action", _index_action)
+    process_audit_logs_queue()
+    assert [action["_op_type"] for action in actions] == ["create"] * 3
+    assert [action["_id"] for action in actions] == [log.id] + ids
+
+    service.record_cls.index.refresh()
+    hits = service.search(system_identity, params={"size": 10}).to_dict()
+    assert {log.id, *ids} <= {hit["id"] for hit in hits["hits"]["hits"]}
+
+
+def test_audit_log_create_buffered(app, db, service, resource_data):
+    """Should persist all the logs of a unit of work together."""
+    app.config["AUDIT_LOGS_BUFFER_EVENTS"] = True
+    model_cls = service.record_cls.model_cls
+    try:
+        with app.test_request_context():
+            count = model_cls.query.count()
+            with UnitOfWork() as uow:
+                first = service.create(
+                    identity=system_identity, data=dict(resource_data), uow=uow
+                )
+                # The logs are not inserted before the unit of work commits,
+                # even when the session is flushed or committed meanwhile
+                uow.session.commit()
+                assert model_cls.query.count() == count
+                second = service.create(
+                    identity=system_identity, data=dict(resource_data), uow=uow
+                )
+                uow.commit()
+
+            for result in (first, second):
+                log = service.read(identity=system_identity, id_=result.id)
+                assert log["resource"]["id"] == "abcd-1234"
+    finally:
+        app.config["AUDIT_LOGS_BUFFER_EVENTS"] = False
+
+
+def test_audit_log_write_behind(app, db, service, resource_data, tmp_path):
+    """Should persist the buffered and spilled logs once flushed."""
+    write_behind = AuditLogWriteBehind(
+        app,
+        service,
+        max_size=1,
+        overflow_policy="spill",
+        spill_path=str(tmp_path / "spill.jsonl"),
+    )
+    service.write_behind = write_behind
+    try:
+        with app.test_request_context():
+            results = [
+                service.create(identity=system_identity, data=dict(resource_data))
+                for _ in range(3)
+            ]
+            write_behind.close()
+
+            assert write_behind.counters["flushed"] == 3
+            for result in results:
+                log = service.read(identity=system_identity, id_=result.id)
+                assert log["resource"]["id"] == "abcd-1234"
+    finally:
+        service.write_behind = None
+
+
+def test_audit_log_write_behind_index_error(
+    app, db, service, resource_data, tmp_path, monkeypatch
+):
+    """Should queue the logs which are inserted but fail to be indexed."""
+    indexer_cls = service.config.indexer_cls
+    queued = []
+
+    def bulk_create(self, records, arguments=None):
+        raise ConnectionError("Search engine timeout.")
+
+    def bulk_create_by_id(self, record_id_iterator):
+        queued.extend(str(id_) for id_ in record_id_iterator)
+
+    monkeypatch.setattr(indexer_cls, "bulk_create", bulk_create)
+    monkeypatch.setattr(indexer_cls, "bulk_create_by_id", bulk_create_by_id)
+    spill_path = tmp_path / "spill.jsonl"
+    write_behind = AuditLogWriteBehind(
+        app, service, max_size=1, overflow_policy="spill", spill_path=str(spill_path)
+    )
+    service.write_behind = write_behind
+    try:
+        with app.test_request_context():
+            results = [
+                service.create(identity=system_identity, data=dict(resource_data))
+                for _ in range(3)
+            ]
+            write_behind.close()
+
+            # The logs are not spilled again, nor dropped
+            counters = write_behind.counters
+            assert counters["flushed"] == 3
+            assert counters["enqueued"] + counters["spilled"] == 3
+            assert counters["dropped"] == 0
+            assert not spill_path.exists()
+            assert sorted(queued) == sorted(result.id for result in results)
+
+            # Spilled logs which are already inserted are skipped
+            log = service.record_cls.get_record(results[0].id)
+            write_behind._spill([log])
+            write_behind.flush()
+            assert write_behind.counters["flushed"] == 3
+            assert not spill_path.exists()
+    finally:
+        service.write_behind = None
+
+
+def test_audit_log_user_cache(app, db, service, resource_data, current_user):
+    """Should cache the resolved users until they are updated."""
+    service.user_cache.clear()
+    user_id = current_user.id
+    with app.test_request_context():
+        g.identity = current_user.identity
+        service.create(identity=current_user.identity, data=dict(resource_data))
+    assert str(user_id) in service.user_cache
+
+    user = current_datastore.get_user(user_id)
+    user.username = "renamed"
+    current_datastore.mark_changed(id(current_datastore.db.session), model=user)
+    current_datastore.commit()
+    assert str(user_id) not in service.user_cache
+
+
+def test_audit_log_export(app, db, service, resource_data, tmp_path):
+    """Should export the logs in chunks and resume from the checkpoint."""
+    with app.test_request_context():
+        service.create_many(system_identity, [dict(resource_data) for _ in range(5)])
+
+        checkpoint = service.export(system_identity, str(tmp_path), chunk_size=2)
+        assert checkpoint["exported"] == 5
+        assert checkpoint["done"]
+        assert checkpoint["chunks"] == [
+            "audit-logs-00000.ndjson.gz",
+            "audit-logs-00001.ndjson.gz",
+            "audit-logs-00002.ndjson.gz",
+        ]
+
+        with gzip.open(tmp_path / checkpoint["chunks"][0], "rt") as fp:
+            logs = [json.loads(line) for line in fp]
+        assert len(logs) == 2
+        assert logs[0]["resource"]["id"] == "abcd-1234"
+        assert logs[0]["user"]["id"] == system_user_id
+
+        # A finished export is not exported again
+        assert (
+            service.export(system_identity, str(tmp_path), chunk_size=2) == checkpoint
+        )
+        with pytest.raises(ValueError):
+            service.export(system_identity, str(tmp_path), fmt="csv")
+
+        # The bounds can be given in ISO format
+        checkpoint = service.export(
+            system_identity,
+            str(tmp_path / "bounds"),
+            created_from="2000-01-01T00:00:00+00:00",
+            created_to=datetime.utcnow() + timedelta(days=1),
+        )
+        assert checkpoint["exported"] == 5
+        assert checkpoint["filters"]["created_from"] == "2000-01-01T00:00:00"
+        with pytest.raises(ValueError):
+            service.export(system_identity, str(tmp_path), created_from="invalid")
+
+
+def test_audit_log_reindex(app, db, service, resource_data, tmp_path):
+    """Should index the logs by partitions and skip the completed ones."""
+    with app.test_request_context():
+        service.create_many(system_identity, [dict(resource_data) for _ in range(3)])
+        db.session.commit()
+
+        reindexer = AuditLogReindex(
+            app,
+            service,
+            workers=1,
+            interval=timedelta(days=1),
+            checkpoint_path=str(tmp_path / "checkpoint.json"),
+        )
+        partitions = reindexer.partitions()
+        assert len(partitions) == 1
+
+        start, end = partitions[0]
+        assert reindex_range(service, start, end) == (0, 3)  # already indexed
+        assert [p[:2] for p in reindexer.run(partitions)] == partitions
+        assert reindexer.partitions() == []
+        # A checkpoint is only resumed with the same time range
+        with pytest.raises(ValueError):
+            reindexer.partitions(created_from=datetime(2000, 1, 1))
+
+
+def test_audit_log_read_timeline(app, db, service):
+    """Should page through the logs of a resource, newest first."""
+    with app.test_request_context():
+        service.create_many(
+            system_identity,
+            [
+                dict(
+                    action="draft.create", resource=dict(type="record", id=f"r-{i % 2}")
+                )
+                for i in range(5)
+            ],
+        )
+
+        page = service.read_timeline(system_identity, "record", "r-0", {"size": 2})
+        hits = page.to_dict()["hits"]["hits"]
+        assert len(hits) == 2
+        assert hits[0]["created"] >= hits[1]["created"]
+        assert all(hit["resource"]["id"] == "r-0" for hit in hits)
+
+        after = page.pagination.next_cursor
+        assert after
+        page = service.read_timeline(
+            system_identity, "record", "r-0", {"size": 2, "after": after}
+        )
+        last_hits = page.to_dict()["hits"]["hits"]
+        assert len(last_hits) == 1
+        assert last_hits[0]["id"] not in {hit["id"] for hit in hits}
+        assert "next" not in page.to_dict()["links"]
+
+
+def test_audit_log_purge(app, db, service, monkeypatch):
+    """Should purge the expired logs matching the retention rules."""
+    with app.test_request_context():
+        for resource_type, count in (("record", 3), ("community", 2)):
+            service.create_many(
+                system_identity,
+                [
+                    dict(
+                        action="draft.create", resource=dict(type=resource_type, id="1")
+                    )
+                    for _ in range(count)
+                ],
+            )
+        db.session.commit()
+
+        monkeypatch.setitem(
+            app.config,
+            "AUDIT_LOGS_RETENTION_RULES",
+            [{"resource_type": "record", "max_age": timedelta(days=1)}],
+        )
+        monkeypatch.setitem(app.config, "AUDIT_LOGS_RETENTION_BATCH_SIZE", 2)
+
+        # Nothing is expired yet
+        report = service.purge(system_identity)
+        assert report["deleted"] == 0
+
+        report = service.purge(
+            system_identity, now=datetime.utcnow() + timedelta(days=2)
+        )
+        assert report["deleted"] == 3
+        assert report["rules"][0]["resource_type"] == "record"
+
+        model_cls = service.record_cls.model_cls
+        assert model_cls.query.filter_by(resource_type="record").count() == 0
+        assert model_cls.query.filter_by(resource_type="community").count() == 2
+
+
+def test_audit_log_archive(app, db, service, resource_data, monkeypatch, tmp_path):
+    """Should move the old logs to the archive and still read them by id."""
+    with app.test_request_context():
+        result = service.create_many(
+            system_identity, [dict(resource_data) for _ in range(3)]
+        )
+        db.session.commit()
+        ids = [str(item.record.id) for item in result.results]
+
+        monkeypatch.setitem(app.config, "AUDIT_LOGS_ARCHIVE_PATH", str(tmp_path))
+        monkeypatch.setitem(app.config, "AUDIT_LOGS_ARCHIVE_SEGMENT_SIZE", 2)
+
+        segments, archived = service.archive_logs(
+            system_identity, datetime.utcnow() + timedelta(days=1)
+        )
+        assert len(segments) == 2
+        assert archived >= 3
+
+        model_cls = service.record_cls.model_cls
+        assert model_cls.query.filter(model_cls.id.in_(ids)).count() == 0
+        for id_ in ids:
+            log = service.read(system_identity, id_).to_dict()
+            assert log["id"] == id_
+            assert log["resource"]["id"] == resource_data["resource"]["id"]
+            assert service.read_revision_id(system_identity, id_) == 0
+
+
+def test_audit_log_read_revision_id(app, db, service, resource_data):
+    """Should read the revision of a log from its version, without its data."""
+    with app.test_request_context():
+        item = service.create(identity=system_identity, data=dict(resource_data))
+        db.session.commit()
+        id_ = str(item.id)
+
+        model = service.record_cls.model_cls.query.get(id_)
+        assert service.read_revision_id(system_identity, id_) == model.version_id - 1
+        assert service.read_revision_id(system_identity, id_) == item.revision_id
+        assert "revision_id" not in service.read(system_identity, id_).to_dict()
+
+        with pytest.raises(NoResultFound):
+            service.read_revision_id(system_identity, str(uuid4()))
+
+
+def test_audit_log_read_archived_partial(app, db, service, monkeypatch, tmp_path):
+    """Should read the archived logs missing some of their fields."""
+    monkeypatch.setitem(app.config, "AUDIT_LOGS_ARCHIVE_PATH", str(tmp_path))
+    id_ = str(uuid4())
+    service.archive.write_segment(
+        [
+            {
+                "id": id_,
+                "@timestamp": "2025-01-01T00:00:00",
+                "action": "draft.create",
+                "resource": {"type": "record"},
+            }
+        ]
+    )
+    with app.test_request_context():
+        log = service.read(system_identity, id_).to_dict()
+    assert log["id"] == id_
+    assert log["resource"]["type"] == "record"
+
+
+def test_audit_log_read_many(app, db, service, resource_data):
+    """Should read the logs in the order of their ids, skipping unknown ones."""
+    with app.test_request_context():
+        result = service.create_many(
+            system_identity, [dict(resource_data) for _ in range(3)]
+        )
+        ids = [str(item.record.id) for item in result.results]
+
+        unknown = "00000000-0000-0000-0000-000000000000"
+        logs = service.read_many(system_identity, [ids[2], unknown, ids[0]]).to_dict()
+        assert [hit["id"] for hit in logs["hits"]["hits"]] == [ids[2], ids[0]]
+        assert logs["hits"]["total"] == 2
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Actions tests."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from invenio_audit_logs import actions
+from invenio_audit_logs.actions import (
+    AuditAction,
+    AuditActionRegistry,
+    MessageRenderer,
+)
+
+
+def test_render_message():
+    """The message template is parsed once."""
+    action = AuditAction(
+        name="draft.create",
+        message_template="User {user_id} created the {resource[type]} {resource_id}.",
+    )
+    assert action.message_fields == {"user_id", "resource", "resource_id"}
+    assert (
+        action.render_message(
+            {"user_id": "1", "resource": {"type": "draft"}, "resource_id": "abcd"}
+        )
+        == "User 1 created the draft abcd."
+    )
+    assert action == AuditAction(action.name, action.message_template)
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "User {user_id} created the {resource[type]} {resource_id}.",
+        "{user.name!r:>10} {{literal}} {tags[0]}",
+        "{count:{width}}",
+        "No fields.",
+    ],
+)
+def test_render_message_format(template):
+    """Templates render like str.format_map."""
+    data = {
+        "user_id": "1",
+        "resource": {"type": "draft"},
+        "resource_id": "abcd",
+        "user": SimpleNamespace(name="Jane"),
+        "tags": ["first"],
+        "count": 3,
+        "width": 4,
+    }
+    assert AuditAction("draft.create", template).render_message(
+        data
+    ) == template.format_map(data)
+
+
+def test_message_renderer():
+    """The messages of the logs are rendered from their dump."""
+    create = AuditAction(
+        name="draft.create",
+        message_template="User {user_id} created the draft {resource_id}.",
+    )
+    publish = AuditAction(
+        name="record.publish",
+        message_template="{user[name]} published the record {resource_id}.",
+    )
+    renderer = MessageRenderer({a.name: a for a in (create, publish)})
+    logs = [
+        {
+            "action": "draft.create",
+            "resource": {"type": "record", "id": "abcd"},
+            "user": {"id": "1"},
+        },
+        {"action": "record.publish", "resource": {"id": "abcd"}, "user": {}},
+        {"action": "draft.edit", "user": {"id": "1"}},
+        {"action": "draft.create", "message": "Stored message."},
+    ]
+    messages = [renderer.render(log).get("message") for log in logs]
+    assert messages == ["User 1 created the draft abcd.", None, None, "Stored message."]
+
+
+def test_message_renderer_invalid_values():
+    """Values the template cannot format leave the message out."""
+    action = AuditAction(
+        name="draft.create", message_template="Created on {created:%Y-%m-%d}."
+    )
+    renderer = MessageRenderer({action.name: action})
+    logs = [
+        {"action": "draft.create", "created": "2025-01-02T10:00:00"},
+        {"action": "draft.create", "created": None},
+    ]
+    assert [renderer.render(log).get("message") for log in logs] == [None, None]
+
+
+def test_registry(monkeypatch):
+    """The entrypoints are loaded on the first lookup only."""
+    loaded = []
+
+    def record_actions():
+        loaded.append("record")
+        return {"draft.create": AuditAction("draft.create", "{user_id}")}
+
+    monkeypatch.setattr(
+        actions,
+        "entry_points",
+        lambda group: [SimpleNamespace(load=lambda: record_actions)],
+    )
+    registry = AuditActionRegistry("invenio_audit_logs.actions")
+    assert loaded == []
+
+    assert registry["draft.create"].name == "draft.create"
+    assert list(registry) == ["draft.create"]
+    assert registry.labels(["draft.create", "draft.edit"]) == {
+        "draft.create": "draft.create",
+        "draft.edit": "draft.edit",
+    }
+    assert loaded == ["record"]
+
+    with pytest.raises(KeyError):
+        registry["draft.edit"]
+    with pytest.raises(TypeError):
+        registry.load()["draft.edit"] = AuditAction("draft.edit", "")
+
+    registry.reset()
+    assert registry["draft.create"].name == "draft.create"
+    assert loaded == ["record", "record"]
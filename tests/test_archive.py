@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Archive tests."""
+
+import os
+from datetime import datetime
+from uuid import uuid4
+
+from invenio_audit_logs.services.archive import AuditLogArchive
+
+
+def _logs(day, count):
+    """Search dumps of logs created on a day of January 2025."""
+    return [
+        {
+            "id": str(uuid4()),
+            "@timestamp": datetime(2025, 1, day, hour).isoformat(),
+            "action": "draft.create",
+            "resource": {"type": "record", "id": str(hour)},
+        }
+        for hour in range(count)
+    ]
+
+
+def test_archive_get(tmp_path):
+    """Archived logs are read by id from their segment."""
+    archive = AuditLogArchive(str(tmp_path / "archive"))
+    assert archive.segments() == []
+
+    first, second = _logs(1, 3), _logs(2, 2)
+    assert archive.write_segment(first) == "segment-00000000.seg"
+    assert archive.write_segment(second) == "segment-00000001.seg"
+    assert archive.segments() == ["segment-00000000.seg", "segment-00000001.seg"]
+
+    for log in first + second:
+        assert archive.get(log["id"]) == log
+    assert archive.get(uuid4()) is None
+    assert first[0]["id"] in archive
+    assert uuid4() not in archive
+
+    index = archive.load_index("segment-00000001.seg")
+    assert index["start"] == second[0]["@timestamp"]
+    assert index["end"] == second[-1]["@timestamp"]
+
+    # Incomplete segments are ignored
+    (tmp_path / "archive" / "segment-00000002.seg").write_bytes(b"")
+    assert len(archive.segments()) == 2
+    assert not any(name.endswith(".part") for name in os.listdir(archive.path))
+
+
+def test_archive_get_many(tmp_path):
+    """Archived logs are looked up without listing the segments each time."""
+    now = [0]
+    archive = AuditLogArchive(str(tmp_path), refresh_interval=1, timer=lambda: now[0])
+    first, second = _logs(1, 3), _logs(2, 2)
+    archive.write_segment(first)
+    archive.write_segment(second)
+
+    listings = []
+    segments = archive.segments
+    archive.segments = lambda: listings.append(1) or segments()
+
+    ids = [first[0]["id"], second[1]["id"], uuid4(), "invalid"]
+    assert archive.get_many(ids) == {
+        first[0]["id"]: first[0],
+        second[1]["id"]: second[1],
+    }
+    assert archive.get_many(ids[2:]) == {}
+    assert listings == [1]
+
+    # Segments written by other processes are found once listed again
+    other = AuditLogArchive(str(tmp_path))
+    third = _logs(3, 1)
+    other.write_segment(third)
+    assert third[0]["id"] not in archive
+    now[0] = 1
+    assert third[0]["id"] in archive
+    assert listings == [1, 1]
+
+
+def test_archive_lookup(tmp_path):
+    """Each log of a large segment is found by id, and only those."""
+    archive = AuditLogArchive(str(tmp_path))
+    logs = [dict(log, id=str(uuid4())) for log in _logs(1, 1) for _ in range(1000)]
+    archive.write_segment(logs)
+
+    assert archive.get_many(log["id"] for log in logs) == {
+        log["id"]: log for log in logs
+    }
+    assert archive.get_many(uuid4() for _ in range(1000)) == {}
+
+
+def test_archive_iter_range(tmp_path):
+    """Archived logs are read by time range, skipping the other segments."""
+    archive = AuditLogArchive(str(tmp_path))
+    logs = _logs(1, 4) + _logs(2, 4)
+    archive.write_segment(logs[:4])
+    archive.write_segment(logs[4:])
+
+    assert list(archive.iter_range()) == logs
+    assert list(archive.iter_range(datetime(2025, 1, 1, 2))) == logs[2:]
+    assert (
+        list(archive.iter_range(datetime(2025, 1, 1, 3), datetime(2025, 1, 2, 1)))
+        == logs[3:5]
+    )
+    assert list(archive.iter_range(datetime(2025, 1, 3))) == []
+
+
+def test_archive_concurrent_writers(tmp_path):
+    """Writers of the same archive write segments with different numbers."""
+    first, second = AuditLogArchive(str(tmp_path)), AuditLogArchive(str(tmp_path))
+    logs = _logs(1, 2)
+    assert first.write_segment(logs[:1]) == "segment-00000000.seg"
+    # A segment being written by another writer reserves its number
+    (tmp_path / "segment-00000001.seg.part").write_bytes(b"")
+    assert second.write_segment(logs[1:]) == "segment-00000002.seg"
+
+    # Segments written by another writer are found
+    assert first.get(logs[1]["id"]) == logs[1]
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Cache tests."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from cachelib import SimpleCache
+
+from invenio_audit_logs.services.cache import SearchResultCache, TTLCache
+
+
+class FakeTimer:
+    """Controllable timer."""
+
+    def __init__(self):
+        """Constructor."""
+        self.now = 0
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+
+def test_cache_lru_eviction():
+    """Least recently used entries are evicted first."""
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.stats == {"hits": 1, "misses": 1, "size": 2}
+
+
+def test_cache_ttl():
+    """Expired entries are treated as missing."""
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=2, ttl=10, timer=timer)
+    cache.set("a", 1)
+
+    timer.now = 9
+    assert cache.get("a") == 1
+    timer.now = 10
+    assert "a" not in cache
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_delete():
+    """Deleted entries are removed."""
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.delete("a")
+    cache.delete("missing")
+    assert cache.get("a") is None
+
+
+def test_search_cache_keys():
+    """Past searches are cached longer and invalidated by late writes only."""
+    timer = FakeTimer()
+    timer.now = datetime(2025, 1, 2, 12, 30, tzinfo=timezone.utc).timestamp()
+    cache = SearchResultCache(
+        SimpleCache(), window=3600, recent_ttl=30, past_ttl=0, timer=timer
+    )
+    identity = SimpleNamespace(provides={"system_process"})
+    past = {"created_from": "2025-01-01T00:00:00", "created_to": "2025-01-02T00:00:00"}
+    recent = {"created_from": "2025-01-02T00:00:00"}
+
+    past_key, ttl = cache.key(identity, past)
+    assert ttl == 0
+    recent_key, ttl = cache.key(identity, recent)
+    assert ttl == 30
+    assert past_key != recent_key
+    assert cache.key(SimpleNamespace(provides={"any_user"}), past)[0] != past_key
+
+    # Logs of the current window do not invalidate the past searches
+    cache.record_write(datetime(2025, 1, 2, 12, 10))
+    assert cache.key(identity, past)[0] == past_key
+
+    # Late logs only invalidate the searches of their window
+    cache.record_write(datetime(2025, 1, 2, 3))
+    assert cache.key(identity, past)[0] == past_key
+    cache.record_write(datetime(2025, 1, 1, 23, 59))
+    assert cache.key(identity, past)[0] != past_key
+
+    past_key = cache.key(identity, past)[0]
+    cache.invalidate()
+    assert cache.key(identity, past)[0] != past_key
+
+
+def test_search_cache_stats():
+    """Hits and misses are counted."""
+    cache = SearchResultCache(SimpleCache())
+    assert cache.get("key") is None
+    cache.set("key", {"hits": {}}, 0)
+    assert cache.get("key") == {"hits": {}}
+    assert cache.stats == {"hits": 1, "misses": 1}
+
+
+def test_search_cache_datetime_params():
+    """The time range can be given as dates."""
+    timer = FakeTimer()
+    timer.now = datetime(2025, 1, 2, 12, 30, tzinfo=timezone.utc).timestamp()
+    cache = SearchResultCache(SimpleCache(), window=3600, timer=timer)
+    identity = SimpleNamespace(provides={"system_process"})
+    past = {
+        "created_from": datetime(2025, 1, 1),
+        "created_to": datetime(2025, 1, 2, tzinfo=timezone.utc),
+    }
+
+    past_key, ttl = cache.key(identity, past)
+    assert ttl == 0
+    # The end date is excluded, so the next window does not invalidate it
+    cache.record_write(datetime(2025, 1, 2))
+    assert cache.key(identity, past)[0] == past_key
+    cache.record_write(datetime(2025, 1, 1, 23, 59))
+    assert cache.key(identity, past)[0] != past_key
+
+
+def test_search_cache_grace():
+    """Windows are closed once their last logs are searchable."""
+    timer = FakeTimer()
+    timer.now = datetime(2025, 1, 2, 13, 0, 30, tzinfo=timezone.utc).timestamp()
+    cache = SearchResultCache(
+        SimpleCache(), window=3600, recent_ttl=30, grace=60, timer=timer
+    )
+    identity = SimpleNamespace(provides={"system_process"})
+    params = {"created_from": "2025-01-02T12:00:00", "created_to": "2025-01-02T13:00"}
+
+    assert cache.key(identity, params)[1] == 30
+    cache.record_write(datetime(2025, 1, 2, 12, 59, 59))
+
+    timer.now += 30
+    past_key, ttl = cache.key(identity, params)
+    assert ttl == 0
+    cache.record_write(datetime(2025, 1, 2, 12, 59, 59))
+    assert cache.key(identity, params)[0] != past_key
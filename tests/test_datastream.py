@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Data stream tests."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from invenio_audit_logs.records.datastream import AuditLogDataStream
+
+
+def _millis(date):
+    """Timestamp in milliseconds of a naive UTC date."""
+    return date.replace(tzinfo=timezone.utc).timestamp() * 1000
+
+
+class FakeClient:
+    """Search client with a data stream of backing indices."""
+
+    def __init__(self, indices):
+        """Constructor.
+
+        :param indices: Dictionary of the backing indices to the creation
+            dates of their logs.
+        """
+        self.backing_indices = indices
+        self.searches = []
+        self.indices = SimpleNamespace(get_data_stream=self.get_data_stream)
+
+    def get_data_stream(self, name):
+        """Get the data stream."""
+        return {
+            "data_streams": [
+                {
+                    "name": name,
+                    "indices": [{"index_name": i} for i in self.backing_indices],
+                }
+            ]
+        }
+
+    def search(self, index, body):
+        """Aggregate the time range of the logs of an index."""
+        self.searches.append(index)
+        dates = self.backing_indices[index]
+        return {
+            "hits": {"total": {"value": len(dates)}},
+            "aggregations": {
+                "first": {"value": _millis(min(dates)) if dates else None},
+                "last": {"value": _millis(max(dates)) if dates else None},
+            },
+        }
+
+
+@pytest.fixture()
+def data_stream():
+    """Data stream of three backing indices, the last one being empty."""
+    client = FakeClient(
+        {
+            ".ds-auditlog-000001": [datetime(2025, 1, 1), datetime(2025, 1, 31)],
+            ".ds-auditlog-000002": [datetime(2025, 2, 1), datetime(2025, 2, 28)],
+            ".ds-auditlog-000003": [],
+        }
+    )
+    app = Flask("testapp")
+    app.config["SEARCH_INDEX_PREFIX"] = ""
+    with app.app_context():
+        yield AuditLogDataStream(client=client)
+
+
+def test_time_ranges(data_stream):
+    """The time ranges of the indices other than the write index are cached."""
+    ranges = data_stream.time_ranges()
+    assert ranges == [
+        (".ds-auditlog-000001", datetime(2025, 1, 1), datetime(2025, 1, 31), 2),
+        (".ds-auditlog-000002", datetime(2025, 2, 1), datetime(2025, 2, 28), 2),
+        (".ds-auditlog-000003", None, None, 0),
+    ]
+    assert data_stream.time_ranges() == ranges
+    assert data_stream._client.searches.count(".ds-auditlog-000001") == 1
+    assert data_stream._client.searches.count(".ds-auditlog-000003") == 2
+
+
+def test_indices_for_range(data_stream):
+    """Only the indices covering the range and the write index are searched."""
+    write_index = ".ds-auditlog-000003"
+    assert data_stream.indices_for_range() == [
+        ".ds-auditlog-000001",
+        ".ds-auditlog-000002",
+        write_index,
+    ]
+    assert data_stream.indices_for_range(end=datetime(2025, 2, 1)) == [
+        ".ds-auditlog-000001",
+        write_index,
+    ]
+    assert data_stream.indices_for_range(start=datetime(2025, 2, 10)) == [
+        ".ds-auditlog-000002",
+        write_index,
+    ]
+    assert data_stream.indices_for_range(start=datetime(2025, 3, 1)) == [write_index]
+
+
+def test_policy(data_stream):
+    """The rollover policy applies to the new backing indices."""
+    policy = data_stream.policy({"min_size": "30gb"})["policy"]
+    assert policy["states"][0]["actions"] == [{"rollover": {"min_size": "30gb"}}]
+    assert policy["ism_template"][0]["index_patterns"] == [f".ds-{data_stream.name}-*"]
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Dumper tests."""
+
+from types import SimpleNamespace
+
+from flask import Flask
+
+from invenio_audit_logs.actions import AuditAction
+from invenio_audit_logs.records.dumpers import EmailDomainDumperExt, MessageDumperExt
+
+
+def test_email_domain_dumper():
+    """The email domain is added to the user and removed on load."""
+    ext = EmailDomainDumperExt()
+
+    data = {"user": {"id": "1", "email": "john.doe@CERN.ch"}}
+    ext.dump(None, data)
+    assert data["user"]["email_domain"] == "cern.ch"
+    ext.load(data, None)
+    assert data == {"user": {"id": "1", "email": "john.doe@CERN.ch"}}
+
+    for data in ({}, {"user": {"id": "system"}}, {"user": {"email": "invalid"}}):
+        ext.dump(None, data)
+        assert "email_domain" not in data.get("user", {})
+
+
+def test_message_dumper():
+    """The message is rendered when enabled and removed on load."""
+    ext = MessageDumperExt()
+    record = SimpleNamespace(
+        action=AuditAction(
+            name="draft.create",
+            message_template="User {user_id} created the draft {resource_id}.",
+        )
+    )
+    data = {"user": {"id": "1"}, "resource": {"type": "record", "id": "abcd"}}
+
+    app = Flask("testapp")
+    with app.app_context():
+        ext.dump(record, data)
+        assert "message" not in data
+
+        app.config["AUDIT_LOGS_INDEX_MESSAGE"] = True
+        ext.dump(record, data)
+        assert data["message"] == "User 1 created the draft abcd."
+
+    ext.load(data, None)
+    assert "message" not in data
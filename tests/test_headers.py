@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Response headers tests."""
+
+import json
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from flask import Flask, g
+from flask_babel import Babel
+from sqlalchemy.orm.exc import NoResultFound
+
+from invenio_audit_logs import config
+from invenio_audit_logs.resources import AuditLogResource, AuditLogResourceConfig
+
+
+class FakeService:
+    """Service returning logs without reading them from the database."""
+
+    def __init__(self):
+        """Constructor."""
+        self.reads = []
+        self.streamed = False
+        self.missing = set()
+
+    def read_revision_id(self, identity, id_):
+        """Current revision of a log."""
+        if id_ in self.missing:
+            raise NoResultFound()
+        return 1
+
+    def search(self, identity, params, search_preference=None):
+        """Search the logs."""
+        data = {"hits": {"hits": [{"id": "1"}], "total": 1}}
+
+        def iter_json():
+            self.streamed = True
+            yield json.dumps(data)
+
+        return SimpleNamespace(to_dict=lambda: data, iter_json=iter_json)
+
+    def read(self, identity, id_):
+        """Read a log."""
+        self.reads.append(id_)
+        data = {"id": str(id_), "action": "draft.create"}
+        return SimpleNamespace(to_dict=lambda: data, revision_id=1)
+
+
+@pytest.fixture()
+def client():
+    """Client of the audit logs resource."""
+    app = Flask("testapp")
+    app.config["AUDIT_LOGS_HTTP_CACHE_CONTROL"] = config.AUDIT_LOGS_HTTP_CACHE_CONTROL
+    Babel(app)
+    resource = AuditLogResource(
+        config=AuditLogResourceConfig.build(app), service=FakeService()
+    )
+    app.register_blueprint(resource.as_blueprint())
+    app.before_request(lambda: setattr(g, "identity", None))
+    client = app.test_client()
+    client.service = resource.service
+    return client
+
+
+def test_read_cache_headers(client):
+    """A log is sent with a strong entity tag and cached for a long time."""
+    id_ = uuid4()
+    res = client.get(f"/audit-logs/{id_}")
+    assert res.status_code == 200
+    assert res.headers["ETag"] == f'"{id_}.1"'
+    assert "immutable" in res.headers["Cache-Control"]
+    assert res.json == {"id": str(id_), "action": "draft.create"}
+
+    # The client holds the current revision, the log is not read again
+    res = client.get(f"/audit-logs/{id_}", headers={"If-None-Match": f'"{id_}.1"'})
+    assert res.status_code == 304
+    assert res.headers["ETag"] == f'"{id_}.1"'
+    assert client.service.reads == [id_]
+
+    # Weak tags and tags of other logs are not matched
+    for etag in (f'W/"{id_}.1"', f'"{id_}.0"', f'"{uuid4()}.1"'):
+        res = client.get(f"/audit-logs/{id_}", headers={"If-None-Match": etag})
+        assert res.status_code == 200
+    assert len(client.service.reads) == 4
+
+    # Missing logs are not matched, even by any tag
+    missing = uuid4()
+    client.service.missing.add(missing)
+    for etag in (f'"{missing}.1"', "*"):
+        res = client.get(f"/audit-logs/{missing}", headers={"If-None-Match": etag})
+        assert res.status_code == 404
+
+
+def test_search_stream(client):
+    """Only plain JSON search responses are streamed."""
+    res = client.get("/audit-logs/?stream=true")
+    assert res.status_code == 200
+    assert client.service.streamed
+    assert res.headers["Content-Type"] == "application/json"
+    assert res.json["hits"]["total"] == 1
+
+    client.service.streamed = False
+
+    res = client.get(
+        "/audit-logs/?stream=true",
+        headers={"Accept": "application/vnd.inveniordm.v1+json"},
+    )
+    assert res.status_code == 200
+    assert not client.service.streamed
+    assert res.headers["Content-Type"] == "application/vnd.inveniordm.v1+json"
+    assert res.json["hits"]["total"] == 1
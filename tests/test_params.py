@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Search parameters tests."""
+
+from datetime import datetime, timezone
+
+import pytest
+from invenio_records_resources.services.errors import QuerystringValidationError
+from invenio_search.engine import dsl
+
+from invenio_audit_logs.services.params import (
+    CursorParam,
+    FiltersParam,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def test_cursor_roundtrip():
+    """Cursors are decoded to the encoded sort values."""
+    sort_values = [1735725600000, "8b7e5e1c-3c4e-4a7e-9f0a-1d2c3b4a5f6e"]
+    assert decode_cursor(encode_cursor(sort_values)) == sort_values
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor([1]), "e30"])
+def test_cursor_invalid(cursor):
+    """Invalid cursors are rejected."""
+    with pytest.raises(QuerystringValidationError):
+        decode_cursor(cursor)
+
+
+def test_cursor_param():
+    """The cursor sorts by timestamp and id and searches after the cursor."""
+    interpreter = CursorParam(None)
+    search = dsl.Search()[10:20]
+    cursor = encode_cursor([1735725600000, "abcd"])
+
+    body = interpreter.apply(None, search, {"size": 10, "after": cursor}).to_dict()
+    assert body["sort"] == [
+        {"@timestamp": {"order": "desc"}},
+        {"id": {"order": "desc"}},
+    ]
+    assert body["from"] == 0
+    assert body["size"] == 10
+    assert body["search_after"] == [1735725600000, "abcd"]
+
+    params = {"size": 5, "after": "", "sort": "oldest"}
+    body = interpreter.apply(None, search, params).to_dict()
+    assert body["sort"][0] == {"@timestamp": {"order": "asc"}}
+    assert "search_after" not in body
+
+    assert interpreter.apply(None, search, {"size": 10}) is search
+
+
+def test_filters_param():
+    """Typed parameters are applied as filters, and kept in the parameters."""
+    interpreter = FiltersParam(None)
+    params = {
+        "action": "draft.create",
+        "resource_type": "record",
+        "user_id": "1",
+        "created_from": datetime(2025, 1, 1),
+        "created_to": "2025-02-01T00:00:00",
+    }
+
+    body = interpreter.apply(None, dsl.Search(), params).to_dict()
+    assert "must" not in body["query"]["bool"]
+    assert body["query"]["bool"]["filter"] == [
+        {"term": {"action": "draft.create"}},
+        {"term": {"resource.type": "record"}},
+        {"term": {"user.id": "1"}},
+        {
+            "range": {
+                "@timestamp": {
+                    "gte": "2025-01-01T00:00:00",
+                    "lt": "2025-02-01T00:00:00",
+                }
+            }
+        },
+    ]
+    assert params["created_from"] == "2025-01-01T00:00:00"
+    assert interpreter.apply(None, dsl.Search(), params)._params == {
+        "pre_filter_shard_size": 1
+    }
+
+    search = dsl.Search()
+    assert interpreter.apply(None, search, {"q": "test"}) is search
+    with pytest.raises(QuerystringValidationError):
+        interpreter.apply(None, search, {"created_to": "yesterday"})
+    with pytest.raises(QuerystringValidationError):
+        interpreter.apply(
+            None,
+            search,
+            {"created_from": "2025-02-01T00:00:00", "created_to": "2025-01-01"},
+        )
+
+
+def test_filters_param_timezones():
+    """Naive and aware dates are compared in UTC."""
+    interpreter = FiltersParam(None)
+    params = {
+        "created_from": datetime(2025, 1, 1),
+        "created_to": "2025-01-01T02:30:00+02:00",
+    }
+
+    body = interpreter.apply(None, dsl.Search(), params).to_dict()
+    assert body["query"]["bool"]["filter"] == [
+        {
+            "range": {
+                "@timestamp": {
+                    "gte": "2025-01-01T00:00:00",
+                    "lt": "2025-01-01T00:30:00",
+                }
+            }
+        },
+    ]
+    assert params["created_to"] == "2025-01-01T00:30:00"
+
+    with pytest.raises(QuerystringValidationError):
+        interpreter.apply(
+            None,
+            dsl.Search(),
+            {
+                "created_from": datetime(2025, 1, 1, 1, tzinfo=timezone.utc),
+                "created_to": "2025-01-01T02:30:00+02:00",
+            },
+        )
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Partitioning tests."""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from invenio_audit_logs.records.partitions import (
+    AuditLogPartitionManager,
+    month_start,
+    next_month,
+)
+
+
+class FakePartitionManager(AuditLogPartitionManager):
+    """Partition manager recording the executed statements."""
+
+    def __init__(self, partitions, default=False):
+        """Constructor."""
+        super().__init__(session=object())
+        self.partitions = partitions
+        self.default = default
+        self.statements = []
+
+    def _execute(self, sql, **params):
+        """Record the statement."""
+        self.statements.append(sql)
+        return SimpleNamespace(scalar=lambda: None)
+
+    def _commit(self):
+        """Record the commit."""
+        self.statements.append("COMMIT")
+
+    def is_supported(self):
+        """The fake database supports partitioning."""
+        return True
+
+    def is_partitioned(self):
+        """The fake table is not partitioned."""
+        return False
+
+    def list_partitions(self):
+        """List the fake partitions."""
+        return self.partitions
+
+    def has_default_partition(self):
+        """Check if there is a fake default partition."""
+        return self.default
+
+
+def test_months():
+    """Month boundaries are computed across years."""
+    assert month_start(datetime(2025, 3, 15, 10)) == datetime(2025, 3, 1)
+    assert next_month(datetime(2025, 3, 15)) == datetime(2025, 4, 1)
+    assert next_month(datetime(2025, 12, 31)) == datetime(2026, 1, 1)
+
+
+def test_create_partitions():
+    """Only the missing partitions are created."""
+    manager = FakePartitionManager(
+        [("audit_logs_metadata_legacy", datetime(2025, 12, 1))]
+    )
+
+    created = manager.create_partitions(months_ahead=2, now=datetime(2025, 11, 20))
+    assert created == ["audit_logs_metadata_p2025_12", "audit_logs_metadata_p2026_01"]
+    assert manager.statements[0] == (
+        "CREATE TABLE audit_logs_metadata_p2025_12 PARTITION OF audit_logs_metadata "
+        "FOR VALUES FROM ('2025-12-01T00:00:00') TO ('2026-01-01T00:00:00')"
+    )
+
+
+def test_create_partitions_default():
+    """The logs of the default partition are moved to the new partitions."""
+    manager = FakePartitionManager(
+        [("audit_logs_metadata_p2025_11", datetime(2025, 12, 1))], default=True
+    )
+
+    created = manager.create_partitions(months_ahead=0, now=datetime(2025, 12, 20))
+    assert created == ["audit_logs_metadata_p2025_12"]
+    assert manager.statements == [
+        "CREATE TABLE audit_logs_metadata_p2025_12 "
+        "(LIKE audit_logs_metadata INCLUDING DEFAULTS)",
+        "INSERT INTO audit_logs_metadata_p2025_12 "
+        "SELECT * FROM audit_logs_metadata_default "
+        "WHERE created >= :start AND created < :end",
+        "DELETE FROM audit_logs_metadata_default "
+        "WHERE created >= :start AND created < :end",
+        "ALTER TABLE audit_logs_metadata ATTACH PARTITION audit_logs_metadata_p2025_12 "
+        "FOR VALUES FROM ('2025-12-01T00:00:00') TO ('2026-01-01T00:00:00')",
+    ]
+
+
+def test_convert():
+    """The bound of the existing logs is validated before locking the table."""
+    # Partitions once the existing table is attached
+    manager = FakePartitionManager(
+        [("audit_logs_metadata_legacy", datetime(2026, 1, 1))]
+    )
+
+    created = manager.convert(months_ahead=2, now=datetime(2025, 11, 30, 12))
+    assert created == ["audit_logs_metadata_p2026_01", "audit_logs_metadata_default"]
+
+    statements = manager.statements
+    constraint = (
+        "ALTER TABLE audit_logs_metadata ADD CONSTRAINT "
+        "audit_logs_metadata_partition_bound "
+        "CHECK (created IS NOT NULL AND created < '2026-01-01T00:00:00') NOT VALID"
+    )
+    lock = "LOCK TABLE audit_logs_metadata IN ACCESS EXCLUSIVE MODE"
+    attach = (
+        "ALTER TABLE audit_logs_metadata ATTACH PARTITION audit_logs_metadata_legacy "
+        "FOR VALUES FROM (MINVALUE) TO ('2026-01-01T00:00:00')"
+    )
+    assert statements.index(constraint) < statements.index(lock)
+    assert statements[statements.index(lock) - 2 : statements.index(lock)] == [
+        "ALTER TABLE audit_logs_metadata VALIDATE CONSTRAINT "
+        "audit_logs_metadata_partition_bound",
+        "COMMIT",
+    ]
+    assert statements[statements.index(attach) + 1] == (
+        "ALTER TABLE audit_logs_metadata_legacy DROP CONSTRAINT "
+        "audit_logs_metadata_partition_bound"
+    )
+
+
+def test_detach_partitions():
+    """Partitions of logs created before the date are detached and dropped."""
+    manager = FakePartitionManager(
+        [
+            ("audit_logs_metadata_legacy", datetime(2025, 1, 1)),
+            ("audit_logs_metadata_p2025_01", datetime(2025, 2, 1)),
+            ("audit_logs_metadata_p2025_02", datetime(2025, 3, 1)),
+        ]
+    )
+
+    detached = manager.detach_partitions(datetime(2025, 2, 15), drop=True)
+    assert detached == ["audit_logs_metadata_legacy", "audit_logs_metadata_p2025_01"]
+    assert manager.statements[-1] == "DROP TABLE audit_logs_metadata_p2025_01"
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Results tests."""
+
+import json
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+from invenio_records_resources.services.base.links import LinksTemplate
+from invenio_search.engine import dsl
+
+from invenio_audit_logs.services.config import AuditLogServiceConfig
+from invenio_audit_logs.services.params import encode_cursor
+from invenio_audit_logs.services.results import AuditLogList, project_hit
+from invenio_audit_logs.services.schema import AuditLogSchema
+
+
+def _hit(**source):
+    """Build a search hit."""
+    return dsl.response.Hit({"_index": "audit-logs", "_id": "1", "_source": source})
+
+
+SOURCE = {
+    "id": "8b7e5e1c-3c4e-4a7e-9f0a-1d2c3b4a5f6e",
+    "version_id": 1,
+    "@timestamp": "2025-01-01T10:00:00.123456+00:00",
+    "updated": "2025-01-01T10:00:00.123456+00:00",
+    "action": "record.publish",
+    "resource_type": "record",
+    "resource": {"type": "record", "id": "abcd-1234"},
+    "metadata": {"ip_address": "127.0.0.1", "session": "abc"},
+    "user": {"id": "1", "name": "user", "email": "user@example.org"},
+    "user_id": "1",
+}
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        SOURCE,
+        {**SOURCE, "@timestamp": "2025-01-01T10:00:00+00:00"},
+        {**SOURCE, "metadata": {}},
+        {k: v for k, v in SOURCE.items() if k != "metadata"},
+        {**SOURCE, "metadata": None},
+        {**SOURCE, "resource": {"type": "record", "id": 1234}},
+        {**SOURCE, "user": {"id": "system", "email": "system@system.org"}},
+        {**SOURCE, "message": "User 1 published the record abcd-1234."},
+    ],
+)
+def test_project_hit(source):
+    """The projection of a hit is the same as the schema dump."""
+    assert project_hit(_hit(**source)) == AuditLogSchema().dump(_hit(**source))
+
+
+def _benchmark(func, size=100, repeat=20):
+    """Best time to project a page of hits."""
+    times = []
+    for _ in range(repeat):
+        # The schema dump modifies the hits, so each run uses new hits
+        hits = [_hit(**SOURCE) for _ in range(size)]
+        start = time.perf_counter()
+        for hit in hits:
+            func(hit)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+@pytest.mark.skipif(
+    not os.environ.get("AUDIT_LOGS_BENCHMARKS"),
+    reason="Timing benchmark, enabled with AUDIT_LOGS_BENCHMARKS=1.",
+)
+def test_project_hit_benchmark():
+    """The projection of a page of hits is faster than the schema dump."""
+    assert _benchmark(project_hit) < _benchmark(AuditLogSchema().dump)
+
+
+def test_iter_json():
+    """The streamed JSON is the same document as ``to_dict()``."""
+    schema = SimpleNamespace(schema=AuditLogSchema)
+    hits = [_hit(**SOURCE), _hit(**{**SOURCE, "metadata": {}})]
+    result = AuditLogList(None, None, hits, schema=schema)
+
+    assert json.loads("".join(result.iter_json())) == result.to_dict()
+    empty = AuditLogList(None, None, [], schema=schema)
+    assert json.loads("".join(empty.iter_json())) == empty.to_dict()
+
+
+def test_cursor_pagination():
+    """The next link of a cursor page continues after its last hit."""
+    response = dsl.response.Response(
+        dsl.Search(),
+        {
+            "hits": {
+                "total": {"value": 3},
+                "hits": [
+                    {"_index": "a", "_id": "2", "_source": SOURCE, "sort": [2, "b"]},
+                    {"_index": "a", "_id": "1", "_source": SOURCE, "sort": [1, "a"]},
+                ],
+            }
+        },
+    )
+    params = {"size": 2, "page": 1, "sort": "newest", "after": ""}
+    result = AuditLogList(
+        None,
+        None,
+        response,
+        params=params,
+        links_tpl=LinksTemplate(
+            AuditLogServiceConfig.links_search, context={"args": params}
+        ),
+        schema=SimpleNamespace(schema=AuditLogSchema),
+    )
+
+    links = result.to_dict()["links"]
+    assert "prev" not in links
+    assert f"after={encode_cursor([1, 'a'])}" in links["next"]
+    assert "page=" not in links["next"]
+
+    params["size"] = 3
+    assert "next" not in result.to_dict()["links"]
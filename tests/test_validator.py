@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-Audit-Logs is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Compiled validator tests."""
+
+import pytest
+from marshmallow import Schema, ValidationError, fields, pre_load
+
+from invenio_audit_logs.services.schema import AuditLogSchema
+from invenio_audit_logs.services.validator import (
+    InvalidData,
+    compile_schema,
+    compiled_loader,
+)
+
+VALID = {
+    "created": "2025-01-01T10:00:00",
+    "action": "record.publish",
+    "resource": {"type": "record", "id": "abcd-1234"},
+}
+
+
+def _load(data):
+    """Load data with marshmallow, returning the result or the errors."""
+    try:
+        return AuditLogSchema().load(data)
+    except ValidationError as e:
+        return e.messages
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        VALID,
+        {**VALID, "id": "log-1"},
+        {**VALID, "unknown": "excluded"},
+        {**VALID, "metadata": {}},
+        {**VALID, "metadata": {"ip_address": "127.0.0.1", "session": "s"}},
+        {**VALID, "user": {"id": "1", "email": "user@example.org"}},
+    ],
+)
+def test_compiled_schema_valid(data):
+    """The compiled schema loads valid data like marshmallow."""
+    load = compile_schema(AuditLogSchema)
+
+    assert load(data) == AuditLogSchema().load(data)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {k: v for k, v in VALID.items() if k != "action"},
+        {k: v for k, v in VALID.items() if k != "created"},
+        {**VALID, "created": "not a date"},
+        {**VALID, "action": 1},
+        {**VALID, "action": None},
+        {**VALID, "resource": "record"},
+        {**VALID, "resource": {"type": "record"}},
+        {**VALID, "resource": {"type": "record", "id": 1, "foo": "bar"}},
+        {**VALID, "metadata": {"ip_address": ["127.0.0.1"]}},
+        {**VALID, "metadata": {"request_id": "r", "unknown": "raised"}},
+    ],
+)
+def test_compiled_schema_invalid(data):
+    """Invalid data falls back to marshmallow and reports the same errors."""
+    load = compile_schema(AuditLogSchema)
+    with pytest.raises(Exception):
+        load(data)
+
+    with pytest.raises(ValidationError) as e:
+        compiled_loader(AuditLogSchema())(data)
+    assert e.value.messages == _load(data)
+
+
+def test_compiled_schema_unsupported():
+    """Schemas with hooks that cannot be compiled are not compiled."""
+
+    class PreLoadSchema(Schema):
+        name = fields.Str()
+
+        @pre_load
+        def _strip(self, data, **kwargs):
+            return {"name": data["name"].strip()}
+
+    assert compile_schema(PreLoadSchema) is None
+    assert compiled_loader(PreLoadSchema())({"name": " a "}) == {"name": "a"}
+
+
+def test_compiled_schema_raises_invalid_data():
+    """Missing required fields raise ``InvalidData``."""
+    with pytest.raises(InvalidData):
+        compile_schema(AuditLogSchema)({"action": "record.publish"})